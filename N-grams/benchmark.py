@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Benchmark the n-gram engine on synthetic corpora and flag regressions
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from ngram_engine import ModelRegistry
+from ngrams import Ngrams
+
+RESULTS_DIR = "benchmarks"
+BASELINE_FILE = os.path.join(RESULTS_DIR, "baseline.json")
+BASE_SENTENCES = 500
+DEFAULT_SCALES = (1, 10, 100)
+ORDERS = (2, 3, 4, 5)
+DIFFICULTIES = ("easy", "medium", "hard")
+SEED = 1234
+BULK_PHRASES = 5000
+# Metrics where a bigger number is better; everything else is a duration or size.
+HIGHER_IS_BETTER = ("tokens_per_s", "phrases_per_s")
+# Durations (``*_s``) must also slow down by this many seconds to be flagged,
+# so sub-millisecond timings do not trip the relative threshold on jitter.
+MIN_DELTA_S = 0.002
+
+_SYLLABLES = ("ka", "lo", "mi", "ten", "ra", "su", "vel", "dor", "an", "is", "qu", "str", "ph", "ing", "tion", "e")
+
+
+def synthetic_corpus(scale: int, seed: int = SEED) -> str:
+    """Deterministic English-like text with a Zipf-ish vocabulary of mixed word lengths"""
+    rng = random.Random(seed)
+    vocab = sorted({"".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(1, 5))) for _ in range(3000)})
+    rng.shuffle(vocab)
+    weights = [1.0 / (rank + 1) for rank in range(len(vocab))]
+    sentences = []
+    for _ in range(BASE_SENTENCES * scale):
+        words = rng.choices(vocab, weights=weights, k=rng.randint(4, 14))
+        words[0] = words[0].capitalize()
+        sentences.append(" ".join(words) + rng.choice(".!?"))
+    return "\n".join(sentences) + "\n"
+
+
+def timed(fn: Callable[[], object], repeat: int = 3) -> float:
+    """Median wall time of ``fn`` in seconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def bench_scale(path: str, scale: int, repeat: int) -> Dict[str, float]:
+    results: Dict[str, float] = {}
+    ngrams_obj = Ngrams(corpus_file=path, n=max(ORDERS), model_registry=ModelRegistry())
+
+    results["load_s"] = timed(lambda: ngrams_obj._load_text(path), repeat)
+    text = ngrams_obj._load_text(path)
+    token_count = len(ngrams_obj._tokenize(text))
+    tokenize_s = timed(lambda: ngrams_obj._tokenize(text), repeat)
+    results["tokenize_s"] = tokenize_s
+    results["tokenize_tokens_per_s"] = token_count / tokenize_s if tokenize_s else 0.0
+    results["tokens"] = token_count
+
+    tokens = ngrams_obj._tokenize(text)
+    for order in ORDERS:
+        ngrams_obj.n = order
+        results[f"build_n{order}_s"] = timed(lambda: ngrams_obj._build_ngram_model(tokens), repeat)
+        tracemalloc.start()
+        model = ngrams_obj._build_ngram_model(tokens)
+        results[f"build_n{order}_peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        results[f"model_n{order}_bytes"] = model.nbytes
+
+    results["sample_us"] = bench_sampling(ngrams_obj, model, tokens)
+    return results
+
+
+def bench_sampling(ngrams_obj: Ngrams, model, tokens: List[str], steps: int = 20000) -> float:
+    """Mean ``_sample_next_token`` latency in microseconds over corpus contexts"""
+    rng = random.Random(SEED)
+    width = ngrams_obj.n - 1
+    contexts = [tuple(tokens[i:i + width]) for i in (rng.randrange(len(tokens) - width) for _ in range(steps))]
+    in_range = lambda length: 5 <= length <= 7
+    ngrams_obj._sample_next_token(contexts[0], model, in_range)
+    ngrams_obj._rng = random.Random(SEED)
+    start = time.perf_counter()
+    for ctx in contexts:
+        ngrams_obj._sample_next_token(ctx, model, in_range)
+    return (time.perf_counter() - start) / steps * 1e6
+
+
+def seeded_generate(ngrams_obj: Ngrams) -> List[str]:
+    """``generate_phrases`` with every draw (model variant, lengths, tokens) from a fresh ``SEED`` stream"""
+    ngrams_obj._rng = random.Random(SEED)
+    return ngrams_obj.generate_phrases()
+
+
+def bench_generation(path: str, repeat: int) -> Dict[str, float]:
+    """End-to-end ``generate_phrases`` latency per difficulty, cold and warm,
+    plus warm ``generate_phrases_bulk`` throughput
+
+    Every timed call draws from its own ``SEED`` stream, so repetitions do the
+    same work; a cold call builds its model in a fresh registry each time.
+    """
+    results: Dict[str, float] = {}
+    for difficulty in DIFFICULTIES:
+        cold = lambda: seeded_generate(Ngrams(corpus_file=path, n=3, difficulty=difficulty, model_registry=ModelRegistry()))
+        results[f"generate_{difficulty}_cold_s"] = timed(cold, repeat)
+        ngrams_obj = Ngrams(corpus_file=path, n=3, difficulty=difficulty, model_registry=ModelRegistry())
+        seeded_generate(ngrams_obj)
+        results[f"generate_{difficulty}_warm_s"] = timed(lambda: seeded_generate(ngrams_obj), repeat)
+        produced = len(ngrams_obj.generate_phrases_bulk(BULK_PHRASES, seed=SEED))
+        bulk_s = timed(lambda: ngrams_obj.generate_phrases_bulk(BULK_PHRASES, seed=SEED), repeat)
+        results[f"bulk_{difficulty}_phrases_per_s"] = produced / bulk_s
+    return results
+
+
+def run_benchmarks(scales=DEFAULT_SCALES, repeat: int = 3) -> dict:
+    results = {
+        "timestamp": datetime.now().isoformat(),
+        "seed": SEED,
+        "base_sentences": BASE_SENTENCES,
+        "scales": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in scales:
+            path = os.path.join(tmp, f"synthetic-{scale}x.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(synthetic_corpus(scale))
+            print(f"⏱️  Scale {scale}x...")
+            metrics = bench_scale(path, scale, repeat)
+            if scale == scales[0]:
+                metrics.update(bench_generation(path, repeat))
+            results["scales"][str(scale)] = metrics
+    return results
+
+
+def compare_to_baseline(results: dict, baseline: dict, threshold: float = 0.2, min_delta: float = MIN_DELTA_S) -> List[str]:
+    """Describe every metric that is more than ``threshold`` worse than the baseline
+
+    Durations must also be at least ``min_delta`` seconds slower.
+    """
+    regressions = []
+    for scale, metrics in results["scales"].items():
+        for name, value in metrics.items():
+            before = baseline.get("scales", {}).get(scale, {}).get(name)
+            if not before or name == "tokens":
+                continue
+            higher_is_better = name.endswith(HIGHER_IS_BETTER)
+            change = (before - value) / before if higher_is_better else (value - before) / before
+            if not higher_is_better and name.endswith("_s") and value - before < min_delta:
+                continue
+            if change > threshold:
+                regressions.append(f"{scale}x {name}: {before:.6g} -> {value:.6g} ({change:+.0%})")
+    return regressions
+
+
+def save_results(results: dict, path: Optional[str] = None) -> str:
+    if path is None:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(RESULTS_DIR, f"results-{stamp}.json")
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    return path
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the n-gram engine")
+    parser.add_argument("--scales", default=",".join(map(str, DEFAULT_SCALES)), help="comma-separated corpus scale factors")
+    parser.add_argument("--repeat", type=int, default=3, help="timing repetitions per metric")
+    parser.add_argument("--output", help="results file (default: benchmarks/results-<timestamp>.json)")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="baseline to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown before flagging")
+    parser.add_argument("--min-delta", type=float, default=MIN_DELTA_S, help="smallest slowdown in seconds a duration must show to be flagged")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    args = parser.parse_args()
+
+    print("📊 N-GRAM ENGINE BENCHMARK")
+    print("=" * 40)
+    scales = tuple(int(s) for s in args.scales.split(",") if s.strip())
+    results = run_benchmarks(scales, args.repeat)
+    print(f"✅ Results written to {save_results(results, args.output)}")
+
+    if args.save_baseline:
+        print(f"✅ Baseline saved to {save_results(results, args.baseline)}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"ℹ️  No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        regressions = compare_to_baseline(results, json.load(f), args.threshold, args.min_delta)
+    if regressions:
+        print(f"❌ {len(regressions)} regression(s) against {args.baseline}:")
+        for line in regressions:
+            print(f"   {line}")
+        return 1
+    print("✅ No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Build corpora/corpora.pkl from the short/medium/long text files
+"""
+import argparse
+import os
+from typing import Optional
+
+from ngram_engine import NEAR_DUPLICATE_THRESHOLD, SECTION_SOURCES, build_corpus, write_corpus
+
+CORPORA_DIR = "corpora"
+CORPUS_FILE = os.path.join(CORPORA_DIR, "corpora.pkl")
+
+
+def build_corpora(output: str = CORPUS_FILE, near_duplicates: Optional[float] = None):
+    """Precompute the exclusive easy/medium/hard sections into an indexed pickle.
+
+    Pass a similarity threshold (e.g. ``NEAR_DUPLICATE_THRESHOLD``) as
+    ``near_duplicates`` to drop near-duplicate sentences as well.
+    """
+    print("📚 BUILD CORPORA")
+    print("=" * 40)
+    try:
+        sources = {name: os.path.join(CORPORA_DIR, filename) for name, filename in SECTION_SOURCES.items()}
+        corpus = build_corpus(sources, near_duplicates=near_duplicates)
+        for name, section in corpus["sections"].items():
+            kept = len(section["offsets"])
+            print(f"✅ {name.capitalize()}: {kept} sentences ({section['raw_count'] - kept} duplicates removed) from {corpus['sources'][name]}")
+        write_corpus(output, corpus)
+        print(f"✅ Wrote {output} ({os.path.getsize(output)} bytes)")
+    except Exception as e:
+        print(f"❌ Error building corpora: {e}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the indexed corpus from the section text files")
+    parser.add_argument("--output", default=CORPUS_FILE, help="corpus file to write")
+    parser.add_argument(
+        "--near-duplicates",
+        nargs="?",
+        type=float,
+        const=NEAR_DUPLICATE_THRESHOLD,
+        metavar="THRESHOLD",
+        help=f"also drop near-duplicate sentences at this MinHash similarity (default {NEAR_DUPLICATE_THRESHOLD})",
+    )
+    args = parser.parse_args()
+    build_corpora(args.output, near_duplicates=args.near_duplicates)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Compile the per-difficulty n-gram models into memory-mappable artifacts
+"""
+import os
+from typing import Optional
+
+from ngrams import Ngrams
+
+MODELS_DIR = os.path.join("corpora", "models")
+MAX_ORDER = 5
+
+
+def model_path(difficulty: str, order: int = MAX_ORDER) -> str:
+    return os.path.join(MODELS_DIR, f"{difficulty}-{order}.ngm")
+
+
+def compile_models(order: int = MAX_ORDER, workers: Optional[int] = None):
+    """Compile easy/medium/hard models up to the given order, counting on ``workers`` processes"""
+    print("🛠️  COMPILE N-GRAM MODELS")
+    print("=" * 40)
+    for difficulty in ("easy", "medium", "hard"):
+        try:
+            ngrams_obj = Ngrams(
+                corpus_file=["corpora/corpora.pkl"],
+                n=order,
+                difficulty=difficulty,
+                build_workers=workers or os.cpu_count(),
+            )
+            path = ngrams_obj.save_compiled_model(model_path(difficulty, order))
+            print(f"✅ {difficulty.capitalize()}: {path} ({os.path.getsize(path)} bytes)")
+        except Exception as e:
+            print(f"❌ {difficulty.capitalize()}: {e}")
+
+
+if __name__ == "__main__":
+    compile_models()
@@ -1,3 +1,4 @@
+from ngram_engine import NEAR_DUPLICATE_THRESHOLD, is_indexed_corpus, near_duplicate_groups, section_sentences
 from ngrams import Ngrams, print_menu, prompt
 from typing_test import run_typing_test_with_ngrams
 
@@ -130,11 +131,14 @@ def verify_corpora_and_generation():
     try:
         with open("corpora/corpora.pkl", "rb") as f:
             data = pickle.load(f)
+        indexed = is_indexed_corpus(data)
         if not isinstance(data, dict):
             data = {}
         lower_map = {str(k).lower(): k for k in data.keys()}
 
         def get_list_for(key_aliases):
+            if indexed:
+                return section_sentences(data, key_aliases[0])
             for alias in key_aliases:
                 if alias in lower_map:
                     val = data[lower_map[alias]]
@@ -156,6 +160,11 @@ def verify_corpora_and_generation():
         hard_easy_overlap = hard_set & easy_set
         hard_med_overlap = hard_set & med_set
 
+        if indexed:
+            print("\n Sections are precomputed (python build_corpus.py); sentences kept / source lines:")
+            for name, section in data["sections"].items():
+                print(f"   • {name.capitalize()}: {len(section['offsets'])} / {section['raw_count']}")
+
         print(f"\n Corpora sizes (unique, normalized):")
         print(f"   • Easy:   {len(easy_set)}")
         print(f"   • Medium: {len(med_set)}")
@@ -173,6 +182,18 @@ def verify_corpora_and_generation():
         show_overlap("Hard ∩ Easy", hard_easy_overlap)
         show_overlap("Hard ∩ Medium", hard_med_overlap)
 
+        print(f"\n Near-duplicates (MinHash similarity ≥ {NEAR_DUPLICATE_THRESHOLD}):")
+        labelled = [(name, text) for name, items in (("Easy", easy_list), ("Medium", med_list), ("Hard", hard_list)) for text in items]
+        groups = near_duplicate_groups(text for _, text in labelled)
+        within = [g for g in groups if len({labelled[i][0] for i in g}) == 1]
+        across = [g for g in groups if len({labelled[i][0] for i in g}) > 1]
+        for name, found in (("within a section", within), ("across sections", across)):
+            if found:
+                sample = "; ".join(" ~ ".join(f"{labelled[i][1]} ({labelled[i][0]})" for i in g[:2]) for g in found[:3])
+                print(f"   • Groups {name}: {len(found)} (e.g., {sample})")
+            else:
+                print(f"   • Groups {name}: 0 ✅")
+
         print("\n Generation validation (words must belong to the selected section):")
         for diff, allowed_set in [("easy", easy_set), ("medium", med_set), ("hard", hard_set)]:
             try:
@@ -0,0 +1,118 @@
+from .artifact import ARTIFACT_VERSION, CompiledModel, compile_model, load_model
+from .compact import CompactModel, CompactOrder, build_compact_model
+from .corpus import (
+    CORPUS_FORMAT,
+    CORPUS_VERSION,
+    SECTION_SOURCES,
+    build_corpus,
+    exclusive_sections,
+    is_indexed_corpus,
+    section_sentences,
+    section_text,
+    write_corpus,
+)
+from .dedup import NEAR_DUPLICATE_THRESHOLD, MinHashIndex, drop_near_duplicates, near_duplicate_groups, shingle_hashes
+from .lexicon import DEFAULT_LEXICON_PATH, LEXICON_FORMAT, WordLexicon, get_word_lexicon
+from .multichain import MultiChainSampler
+from .parallel import PARALLEL_BUILD_MIN_TOKENS, build_compact_model_parallel, split_sentences
+from .perplexity import PhraseScore, PhraseScorer
+from .profiling import NO_STAGE, GenerationProfiler
+from .pruning import PruningPolicy, prune_model
+from .registry import (
+    ModelEntry,
+    ModelRegistry,
+    configure_model_registry,
+    corpus_fingerprint,
+    get_model_registry,
+)
+from .sampler import LENGTH_RULES, InterpolatedSampler, TEMPERATURE_BUCKETS, length_rule
+from .scoring import FEATURES_VERSION, categorize_by_rank, length_score, pattern_score, score_vocabulary, syllable_score, word_features
+from .sharedmem import SharedModel, attach_model, publish_model
+from .shards import (
+    MAX_LOAD_THREADS,
+    PROCESS_TOKENIZE_MIN_CHARS,
+    ends_sentence,
+    expand_corpus_paths,
+    is_sharded,
+    merge_shard_tokens,
+)
+from .stats import CorpusStats
+from .streaming import DEFAULT_CHUNK_SIZE, iter_sentence_tokens, iter_string_chunks, iter_text_chunks
+from .suffix import SuffixArrayModel, build_suffix_model
+from .trie import MODEL_BACKENDS, TrieLevel, TrieModel, build_trie_model
+from .watcher import CorpusWatcher
+
+__all__ = [
+    "ARTIFACT_VERSION",
+    "DEFAULT_CHUNK_SIZE",
+    "DEFAULT_LEXICON_PATH",
+    "CORPUS_FORMAT",
+    "CORPUS_VERSION",
+    "CompactModel",
+    "CompactOrder",
+    "CompiledModel",
+    "CorpusStats",
+    "CorpusWatcher",
+    "FEATURES_VERSION",
+    "GenerationProfiler",
+    "InterpolatedSampler",
+    "LENGTH_RULES",
+    "LEXICON_FORMAT",
+    "MAX_LOAD_THREADS",
+    "MODEL_BACKENDS",
+    "MinHashIndex",
+    "ModelEntry",
+    "ModelRegistry",
+    "MultiChainSampler",
+    "NEAR_DUPLICATE_THRESHOLD",
+    "NO_STAGE",
+    "PARALLEL_BUILD_MIN_TOKENS",
+    "PhraseScore",
+    "PhraseScorer",
+    "PROCESS_TOKENIZE_MIN_CHARS",
+    "PruningPolicy",
+    "SECTION_SOURCES",
+    "SharedModel",
+    "SuffixArrayModel",
+    "TEMPERATURE_BUCKETS",
+    "TrieLevel",
+    "TrieModel",
+    "WordLexicon",
+    "attach_model",
+    "build_compact_model",
+    "build_compact_model_parallel",
+    "build_corpus",
+    "build_suffix_model",
+    "build_trie_model",
+    "categorize_by_rank",
+    "compile_model",
+    "configure_model_registry",
+    "corpus_fingerprint",
+    "drop_near_duplicates",
+    "ends_sentence",
+    "exclusive_sections",
+    "expand_corpus_paths",
+    "get_model_registry",
+    "get_word_lexicon",
+    "is_indexed_corpus",
+    "is_sharded",
+    "iter_sentence_tokens",
+    "iter_string_chunks",
+    "iter_text_chunks",
+    "length_rule",
+    "length_score",
+    "load_model",
+    "merge_shard_tokens",
+    "near_duplicate_groups",
+    "pattern_score",
+    "prune_model",
+    "publish_model",
+    "score_vocabulary",
+    "section_sentences",
+    "section_text",
+    "shingle_hashes",
+    "split_sentences",
+    "syllable_score",
+    "word_features",
+    "write_corpus",
+]
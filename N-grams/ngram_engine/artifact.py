@@ -0,0 +1,157 @@
+import json
+import mmap
+import os
+import sys
+from array import array
+from typing import Dict, List, Optional
+
+from .compact import CompactModel, CompactOrder
+
+MAGIC = b"NGRAMMDL"
+ARTIFACT_VERSION = 2
+_PREFIX_SIZE = len(MAGIC) + 8
+_ALIGN = 8
+_ORDER_ARRAYS = (("keys", "q"), ("offsets", "i"), ("successors", "i"), ("counts", "i"), ("totals", "i"))
+
+
+def _data_start(header_len: int) -> int:
+    start = _PREFIX_SIZE + header_len
+    return start + (-start) % _ALIGN
+
+
+class CompiledModel(CompactModel):
+    """A :class:`CompactModel` whose arrays are memory-mapped from disk.
+
+    The arrays are views into a read-only mapping, so every process that
+    opens the same artifact shares its pages with the others.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Model artifact '{path}' is empty.")
+        try:
+            self._load(memoryview(self._mmap))
+        except ValueError:
+            self.close()
+            raise
+
+    def _load(self, buf: memoryview) -> None:
+        """Parse an artifact laid out by :func:`compile_model` from ``buf`` without copying it."""
+        if bytes(buf[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"'{self.path}' is not an n-gram model artifact.")
+        version = int.from_bytes(buf[len(MAGIC):len(MAGIC) + 4], "little")
+        header_len = int.from_bytes(buf[len(MAGIC) + 4:_PREFIX_SIZE], "little")
+        if version != ARTIFACT_VERSION:
+            raise ValueError(f"Model artifact version {version} is not supported (expected {ARTIFACT_VERSION}).")
+        self.header = json.loads(bytes(buf[_PREFIX_SIZE:_PREFIX_SIZE + header_len]).decode("utf-8"))
+        self.difficulty: Optional[str] = self.header.get("difficulty")
+        self._swap = self.header["byteorder"] != sys.byteorder
+        self._buf = buf[_data_start(header_len):]
+
+        vocab = bytes(self._section("vocab")).decode("utf-8").split("\n")
+        orders: Dict[int, CompactOrder] = {}
+        for order_key in self.header["orders"]:
+            order = int(order_key)
+            arrays = [self._section_array(f"order{order}.{name}", typecode) for name, typecode in _ORDER_ARRAYS]
+            orders[order] = CompactOrder(order, *arrays)
+        super().__init__(vocab, self._section_array("unigram", "i"), orders)
+
+    def _section(self, name: str) -> memoryview:
+        section = self.header["sections"][name]
+        return self._buf[section["offset"]:section["offset"] + section["nbytes"]]
+
+    def _section_array(self, name: str, typecode: str):
+        view = self._section(name)
+        if not self._swap:
+            return view.cast(typecode)
+        copy = array(typecode)
+        copy.frombytes(bytes(view))
+        copy.byteswap()
+        return copy
+
+    def close(self) -> None:
+        self.orders = {}
+        self.unigram = array("i")
+        self._buf = None
+        try:
+            self._mmap.close()
+        except (AttributeError, BufferError):
+            pass
+        self._file.close()
+
+
+def artifact_blobs(model: CompactModel, metadata: Optional[dict] = None) -> List[bytes]:
+    """The bytes of a model artifact, in order, as written by :func:`compile_model`.
+
+    Layout: magic, version and header length, a JSON header describing the
+    sections, then an 8-byte aligned data block holding the vocabulary blob,
+    the unigram counts and the CSR arrays of every order. Section offsets
+    are relative to the data block. Pending incremental counts are
+    compacted into a copy of ``model``, which is left as it is.
+    """
+    if model.delta:
+        model = model.copy()
+        model.compact()
+    blobs: List[bytes] = []
+    sections: Dict[str, dict] = {}
+    cursor = 0
+
+    def add(name: str, data: bytes) -> None:
+        nonlocal cursor
+        padding = (-cursor) % _ALIGN
+        if padding:
+            blobs.append(b"\0" * padding)
+            cursor += padding
+        sections[name] = {"offset": cursor, "nbytes": len(data)}
+        blobs.append(data)
+        cursor += len(data)
+
+    add("vocab", "\n".join(model.vocab).encode("utf-8"))
+    add("unigram", array("i", model.unigram).tobytes())
+    for order, table in sorted(model.orders.items()):
+        for name, typecode in _ORDER_ARRAYS:
+            add(f"order{order}.{name}", array(typecode, getattr(table, name)).tobytes())
+
+    header = dict(metadata or {})
+    header.update({
+        "n": model.n,
+        "vocab_size": model.vocab_size,
+        "byteorder": sys.byteorder,
+        "orders": sorted(str(order) for order in model.orders),
+        "sections": sections,
+    })
+    header_bytes = json.dumps(header, sort_keys=True).encode("utf-8")
+    data_start = _data_start(len(header_bytes))
+    prefix = [
+        MAGIC,
+        ARTIFACT_VERSION.to_bytes(4, "little"),
+        len(header_bytes).to_bytes(4, "little"),
+        header_bytes,
+        b"\0" * (data_start - _PREFIX_SIZE - len(header_bytes)),
+    ]
+    return prefix + blobs
+
+
+def compile_model(path: str, model: CompactModel, metadata: Optional[dict] = None) -> str:
+    """Write a built model to a versioned binary artifact at ``path``."""
+    blobs = artifact_blobs(model, metadata)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        for blob in blobs:
+            f.write(blob)
+    os.replace(temp_path, path)
+    return path
+
+
+def load_model(path: str) -> CompiledModel:
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Model artifact '{path}' not found!")
+    return CompiledModel(path)
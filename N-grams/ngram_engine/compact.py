@@ -0,0 +1,394 @@
+import copy
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+START = "<START>"
+END = "<END>"
+# Width of one token id inside the temporary packed keys used while counting.
+_ID_BITS = 32
+_ID_MASK = (1 << _ID_BITS) - 1
+
+
+class CompactOrder:
+    """CSR successor table for one n-gram order.
+
+    Contexts are stored as sorted int64 keys. An order-2 context is the id
+    of its single token; an order-k context ``(w1, ..., wk-1)`` is keyed as
+    ``row_of((w2, ..., wk-1)) * V + w1``, i.e. through the row of its suffix
+    in the order below, so keys stay small no matter how high the order.
+    Row ``i`` owns ``successors[offsets[i]:offsets[i + 1]]`` (sorted ids)
+    with the matching ``counts`` and their sum in ``totals[i]``.
+    """
+
+    __slots__ = ("order", "keys", "offsets", "successors", "counts", "totals")
+
+    def __init__(self, order: int, keys: Sequence[int], offsets: Sequence[int], successors: Sequence[int], counts: Sequence[int], totals: Sequence[int]):
+        self.order = order
+        self.keys = keys
+        self.offsets = offsets
+        self.successors = successors
+        self.counts = counts
+        self.totals = totals
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def find(self, key: int) -> int:
+        keys = self.keys
+        i = bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            return i
+        return -1
+
+    def row(self, i: int) -> Tuple[Sequence[int], Sequence[int]]:
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return self.successors[start:end], self.counts[start:end]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            len(arr) * getattr(arr, "itemsize", 4)
+            for arr in (self.keys, self.offsets, self.successors, self.counts, self.totals)
+        )
+
+
+class CompactModel:
+    """Interned vocabulary plus one :class:`CompactOrder` per order 2..n.
+
+    Counts added after the build (:meth:`add_tokens`) go to a small
+    per-context delta that lookups merge with the CSR rows; once it grows
+    past a fraction of the base tables it is folded in by :meth:`compact`.
+    Updates mutate the model, so a model other threads sample from is
+    updated through a :meth:`copy` that replaces it once done.
+    """
+
+    def __init__(self, vocab: List[str], unigram: Sequence[int], orders: Dict[int, CompactOrder], radix: Optional[int] = None):
+        self.vocab = vocab
+        self.index: Dict[str, int] = {tok: i for i, tok in enumerate(vocab)}
+        self.unigram = unigram
+        self.orders = orders
+        self.n = max(orders) if orders else 1
+        self.total_unigrams = sum(unigram)
+        # Vocabulary size the context keys were packed with; ids added later
+        # can only appear in the delta.
+        self.radix = radix if radix is not None else len(vocab)
+        self.delta: Dict[int, Dict[int, Dict[int, int]]] = {}
+        self.delta_edges = 0
+        self.version = 0
+        self.pruning_stats: Optional[dict] = None
+        self._masks: Dict[Hashable, bytearray] = {}
+
+    @property
+    def vocab_size(self) -> int:
+        return len(self.vocab)
+
+    @property
+    def unigram_counts(self) -> Counter:
+        vocab = self.vocab
+        return Counter({vocab[i]: count for i, count in enumerate(self.unigram) if count})
+
+    @property
+    def nbytes(self) -> int:
+        unigram_bytes = len(self.unigram) * getattr(self.unigram, "itemsize", 4)
+        return unigram_bytes + sum(table.nbytes for table in self.orders.values())
+
+    def order_sizes(self) -> Dict[int, Dict[str, int]]:
+        return {
+            order: {"contexts": len(table), "edges": len(table.successors)}
+            for order, table in sorted(self.orders.items())
+        }
+
+    def vocab_mask(self, key: Hashable, predicate: Callable[[str], bool]) -> bytearray:
+        """Cached 0/1 flag per vocabulary id, extended as the vocabulary grows."""
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = self._masks[key] = bytearray()
+        if len(mask) < len(self.vocab):
+            mask.extend(1 if predicate(tok) else 0 for tok in self.vocab[len(mask):])
+        return mask
+
+    def context_rows(self, ctx_ids: Sequence[int], max_order: Optional[int] = None) -> List[Tuple[int, int]]:
+        """(order, row) for every order whose context (a suffix of ``ctx_ids``) was seen."""
+        top = min(self.n, max_order or self.n, len(ctx_ids) + 1)
+        rows: List[Tuple[int, int]] = []
+        if top < 2 or ctx_ids[-1] < 0:
+            return rows
+        radix = self.radix
+        key = ctx_ids[-1]
+        if key >= radix:
+            return rows
+        for order in range(2, top + 1):
+            if order > 2:
+                tok_id = ctx_ids[-(order - 1)]
+                if tok_id < 0 or tok_id >= radix:
+                    break
+                key = row * radix + tok_id
+            row = self.orders[order].find(key)
+            if row < 0:
+                break
+            rows.append((order, row))
+        return rows
+
+    def context_counts(self, ctx_ids: Sequence[int], max_order: Optional[int] = None) -> List[Tuple[int, int, Sequence[int], Sequence[int]]]:
+        """(order, total, successor ids, counts) per seen order, delta included."""
+        if not self.delta:
+            result = []
+            for order, row in self.context_rows(ctx_ids, max_order):
+                table = self.orders[order]
+                ids, counts = table.row(row)
+                result.append((order, table.totals[row], ids, counts))
+            return result
+
+        top = min(self.n, max_order or self.n, len(ctx_ids) + 1)
+        base_rows = dict(self.context_rows(ctx_ids, top))
+        result = []
+        raw_ctx = 0
+        for order in range(2, top + 1):
+            tok_id = ctx_ids[-(order - 1)]
+            if tok_id < 0:
+                break
+            raw_ctx |= tok_id << (_ID_BITS * (order - 2))
+            extra = self.delta.get(order, {}).get(raw_ctx)
+            row = base_rows.get(order)
+            if row is None and not extra:
+                break
+            if row is None:
+                result.append((order, sum(extra.values()), list(extra), list(extra.values())))
+                continue
+            table = self.orders[order]
+            ids, counts = table.row(row)
+            total = table.totals[row]
+            if extra:
+                merged = dict(zip(ids, counts))
+                for tok_id, count in extra.items():
+                    merged[tok_id] = merged.get(tok_id, 0) + count
+                total += sum(extra.values())
+                ids, counts = list(merged), list(merged.values())
+            result.append((order, total, ids, counts))
+        return result
+
+    def delta_contexts(self, ctx_ids: Sequence[int], max_order: Optional[int] = None) -> Tuple[Tuple[int, int], ...]:
+        """(order, packed context) of every order whose context has pending delta counts."""
+        top = min(self.n, max_order or self.n, len(ctx_ids) + 1)
+        found: List[Tuple[int, int]] = []
+        raw_ctx = 0
+        for order in range(2, top + 1):
+            tok_id = ctx_ids[-(order - 1)]
+            if tok_id < 0:
+                break
+            raw_ctx |= tok_id << (_ID_BITS * (order - 2))
+            if raw_ctx in self.delta.get(order, ()):
+                found.append((order, raw_ctx))
+        return tuple(found)
+
+    def context_ids(self, ctx: Sequence[str]) -> List[int]:
+        index = self.index
+        return [index.get(tok, -1) for tok in ctx]
+
+    def successors(self, ctx: Sequence[str], order: int) -> Optional[Dict[str, int]]:
+        """Successor counts of the last ``order - 1`` tokens of ``ctx``, or ``None``."""
+        for found_order, _total, ids, counts in self.context_counts(self.context_ids(ctx), max_order=order):
+            if found_order == order:
+                vocab = self.vocab
+                return {vocab[tok_id]: count for tok_id, count in zip(ids, counts)}
+        return None
+
+    def copy(self) -> "CompactModel":
+        """A copy to update off to the side; the read-only base tables are shared."""
+        clone = copy.copy(self)
+        clone.vocab = list(self.vocab)
+        clone.index = dict(self.index)
+        clone.unigram = array("i", self.unigram)
+        clone.delta = {order: {raw_ctx: dict(row) for raw_ctx, row in rows.items()} for order, rows in self.delta.items()}
+        clone._masks = {key: bytearray(mask) for key, mask in self._masks.items()}
+        return clone
+
+    def add_tokens(self, tokens: Iterable[str], compact_ratio: float = 0.25) -> int:
+        """Count a ``<START>``/``<END>`` token stream into the model in place.
+
+        Returns the number of counted positions. The delta is compacted into
+        the CSR tables once it holds more than ``compact_ratio`` times the
+        base edge count (and at least a few thousand edges).
+        """
+        if not isinstance(self.unigram, array):
+            self.unigram = array("i", self.unigram)
+        width = self.n - 1
+        added = 0
+        for context, tok_id in _iter_positions(tokens, width, self.vocab, self.index, self.unigram):
+            raw_ctx = 0
+            for order in range(2, self.n + 1):
+                raw_ctx |= context[-(order - 1)] << (_ID_BITS * (order - 2))
+                row = self.delta.setdefault(order, {}).setdefault(raw_ctx, {})
+                if tok_id not in row:
+                    self.delta_edges += 1
+                row[tok_id] = row.get(tok_id, 0) + 1
+            added += 1
+        if not added:
+            return 0
+        self.total_unigrams += added
+        self.version += 1
+        base_edges = sum(len(table.successors) for table in self.orders.values())
+        if self.delta_edges > max(4096, compact_ratio * base_edges):
+            self.compact()
+        return added
+
+    def _raw_contexts(self) -> Dict[int, List[int]]:
+        raw: Dict[int, List[int]] = {}
+        for order in sorted(self.orders):
+            keys = self.orders[order].keys
+            if order == 2:
+                raw[order] = list(keys)
+                continue
+            suffix_raw = raw[order - 1]
+            shift = _ID_BITS * (order - 2)
+            raw[order] = [
+                (tok_id << shift) | suffix_raw[row]
+                for row, tok_id in (divmod(key, self.radix) for key in keys)
+            ]
+        return raw
+
+    def compact(self) -> None:
+        """Fold pending delta counts into freshly built CSR tables."""
+        if not self.delta:
+            return
+        edge_counts: Dict[int, Dict[int, int]] = {order: {} for order in range(2, self.n + 1)}
+        for order, raw_ctx_list in self._raw_contexts().items():
+            table = self.orders[order]
+            bucket = edge_counts[order]
+            for row, raw_ctx in enumerate(raw_ctx_list):
+                ids, counts = table.row(row)
+                for tok_id, count in zip(ids, counts):
+                    bucket[(raw_ctx << _ID_BITS) | tok_id] = count
+        for order, rows in self.delta.items():
+            bucket = edge_counts[order]
+            for raw_ctx, successors in rows.items():
+                for tok_id, count in successors.items():
+                    edge = (raw_ctx << _ID_BITS) | tok_id
+                    bucket[edge] = bucket.get(edge, 0) + count
+        rebuilt = _finalize(self.vocab, self.unigram, edge_counts)
+        self.orders = rebuilt.orders
+        self.radix = rebuilt.radix
+        self.delta = {}
+        self.delta_edges = 0
+        self.version += 1
+
+
+def _iter_positions(
+    tokens: Iterable[str],
+    width: int,
+    vocab: List[str],
+    index: Dict[str, int],
+    unigram: array,
+) -> Iterator[Tuple[List[int], int]]:
+    """Yield ``(context ids, token id)`` for every counted token.
+
+    Non-alphabetic tokens are dropped, a sentence's context is padded with
+    ``<START>`` and reset after ``<END>``. New tokens are interned into
+    ``vocab``/``index`` and every yielded token is added to ``unigram``. The
+    context list is reused, so consume it before advancing.
+    """
+    start_id = index[START]
+    context: List[int] = []
+    for tok in tokens:
+        if tok == START:
+            context = [start_id] * width
+            continue
+        if tok != END and not tok.isalpha():
+            continue
+        if not context:
+            context = [start_id] * width
+
+        tok_id = index.get(tok)
+        if tok_id is None:
+            tok_id = len(vocab)
+            index[tok] = tok_id
+            vocab.append(tok)
+            unigram.append(0)
+        unigram[tok_id] += 1
+
+        yield context, tok_id
+
+        context.append(tok_id)
+        del context[0]
+        if tok == END:
+            context = []
+
+
+def _finalize(vocab: List[str], unigram: array, edge_counts: Dict[int, Dict[int, int]]) -> CompactModel:
+    vocab_size = len(vocab)
+    orders: Dict[int, CompactOrder] = {}
+    suffix_rows: Dict[int, int] = {}
+    for order in sorted(edge_counts):
+        edges = edge_counts[order]
+        suffix_bits = _ID_BITS * (order - 2)
+        suffix_mask = (1 << suffix_bits) - 1
+        raw_to_key: Dict[int, int] = {}
+        for edge in edges:
+            raw_ctx = edge >> _ID_BITS
+            if raw_ctx in raw_to_key:
+                continue
+            if order == 2:
+                raw_to_key[raw_ctx] = raw_ctx
+            else:
+                raw_to_key[raw_ctx] = suffix_rows[raw_ctx & suffix_mask] * vocab_size + (raw_ctx >> suffix_bits)
+
+        ordered_ctx = sorted(raw_to_key, key=raw_to_key.__getitem__)
+        rows = {raw_ctx: i for i, raw_ctx in enumerate(ordered_ctx)}
+        by_row: List[List[Tuple[int, int]]] = [[] for _ in ordered_ctx]
+        for edge, count in edges.items():
+            by_row[rows[edge >> _ID_BITS]].append((edge & _ID_MASK, count))
+
+        keys = array("q", (raw_to_key[raw_ctx] for raw_ctx in ordered_ctx))
+        offsets = array("i", [0])
+        successors = array("i")
+        counts = array("i")
+        totals = array("i")
+        for row_edges in by_row:
+            row_edges.sort()
+            total = 0
+            for tok_id, count in row_edges:
+                successors.append(tok_id)
+                counts.append(count)
+                total += count
+            offsets.append(len(successors))
+            totals.append(total)
+        orders[order] = CompactOrder(order, keys, offsets, successors, counts, totals)
+        suffix_rows = rows
+    return CompactModel(vocab, unigram, orders)
+
+
+def _count_edges(
+    tokens: Iterable[str],
+    n: int,
+    vocab: List[str],
+    index: Dict[str, int],
+    unigram: array,
+) -> Dict[int, Dict[int, int]]:
+    """Packed ``(context, token) -> count`` tables for orders 2..n."""
+    edge_counts: Dict[int, Dict[int, int]] = {order: {} for order in range(2, n + 1)}
+    for context, tok_id in _iter_positions(tokens, n - 1, vocab, index, unigram):
+        raw_ctx = 0
+        for order in range(2, n + 1):
+            raw_ctx |= context[-(order - 1)] << (_ID_BITS * (order - 2))
+            bucket = edge_counts[order]
+            edge = (raw_ctx << _ID_BITS) | tok_id
+            bucket[edge] = bucket.get(edge, 0) + 1
+    return edge_counts
+
+
+def build_compact_model(tokens: Iterable[str], n: int) -> CompactModel:
+    """Count orders 2..n over a ``<START>``/``<END>`` token stream."""
+    n = max(2, int(n))
+    vocab: List[str] = [START]
+    index: Dict[str, int] = {START: 0}
+    unigram = array("i", [0])
+    edge_counts = _count_edges(tokens, n, vocab, index, unigram)
+
+    if END not in index:
+        index[END] = len(vocab)
+        vocab.append(END)
+        unigram.append(1)
+
+    return _finalize(vocab, unigram, edge_counts)
@@ -0,0 +1,122 @@
+import os
+import pickle
+from array import array
+from typing import Dict, List, Optional
+
+from .dedup import MinHashIndex, drop_near_duplicates
+
+CORPUS_FORMAT = "ngrams-corpus"
+CORPUS_VERSION = 1
+SECTION_ORDER = ("easy", "medium", "hard")
+SECTION_SOURCES = {
+    "easy": "short-texts.txt",
+    "medium": "medium-texts.txt",
+    "hard": "long-texts.txt",
+}
+SECTION_SYNONYMS = {
+    "easy": ["easy", "basic", "simple", "short"],
+    "medium": ["medium", "moderate"],
+    "hard": ["hard", "difficult", "deep", "long"],
+}
+
+
+def normalize_sentence(sentence: str) -> str:
+    return " ".join(sentence.split()).strip().lower()
+
+
+def exclusive_sections(sections: Dict[str, List[str]], near_duplicates: Optional[float] = None) -> Dict[str, List[str]]:
+    """Drop repeats inside each section and everything an easier section already has.
+
+    With ``near_duplicates`` set, a sentence is also dropped when its
+    MinHash similarity to a sentence kept in the same or an easier section
+    reaches that threshold.
+    """
+    exclusive: Dict[str, List[str]] = {}
+    easier = set()
+    index = MinHashIndex(threshold=near_duplicates) if near_duplicates else None
+    for name in SECTION_ORDER:
+        if name not in sections:
+            continue
+        seen = set()
+        kept = []
+        for sentence in sections[name]:
+            norm = normalize_sentence(sentence)
+            if norm in easier or norm in seen:
+                continue
+            seen.add(norm)
+            kept.append(sentence)
+        exclusive[name] = drop_near_duplicates(kept, index) if index is not None else kept
+        easier.update(normalize_sentence(sentence) for sentence in sections[name])
+    return exclusive
+
+
+def build_corpus(sources: Dict[str, str], encoding: str = "utf-8", near_duplicates: Optional[float] = None) -> dict:
+    """Read one text file per section (one sentence per line) into the indexed format.
+
+    Each section stores its exclusive sentences joined by newlines plus the
+    start offset of every sentence, so loaders can use the text as is and
+    still address single sentences. ``near_duplicates`` is passed on to
+    :func:`exclusive_sections`.
+    """
+    raw: Dict[str, List[str]] = {}
+    for name, path in sources.items():
+        with open(path, "r", encoding=encoding) as f:
+            raw[name] = f.read().splitlines()
+
+    sections = {}
+    for name, sentences in exclusive_sections(raw, near_duplicates).items():
+        offsets = array("I")
+        cursor = 0
+        for sentence in sentences:
+            offsets.append(cursor)
+            cursor += len(sentence) + 1
+        sections[name] = {
+            "text": "\n".join(sentences),
+            "offsets": offsets,
+            "raw_count": len(raw[name]),
+        }
+    return {
+        "format": CORPUS_FORMAT,
+        "version": CORPUS_VERSION,
+        "sources": {name: os.path.basename(path) for name, path in sources.items()},
+        "sections": sections,
+    }
+
+
+def write_corpus(path: str, corpus: dict) -> str:
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        pickle.dump(corpus, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, path)
+    return path
+
+
+def is_indexed_corpus(data) -> bool:
+    return isinstance(data, dict) and data.get("format") == CORPUS_FORMAT
+
+
+def find_section(data: dict, section: str) -> Optional[dict]:
+    sections = data["sections"]
+    canonical = section.lower()
+    for candidate in SECTION_SYNONYMS.get(canonical, [canonical]):
+        if candidate in sections:
+            return sections[candidate]
+    return None
+
+
+def section_text(data: dict, section: Optional[str] = None) -> str:
+    """Ready-to-use text of one section, or of every section when ``section`` is None"""
+    if section:
+        found = find_section(data, section)
+        if found is not None:
+            return found["text"]
+    return "\n".join(entry["text"] for entry in data["sections"].values())
+
+
+def section_sentences(data: dict, section: str) -> List[str]:
+    found = find_section(data, section)
+    if found is None:
+        return []
+    text, offsets = found["text"], found["offsets"]
+    ends = list(offsets[1:]) + [len(text) + 1]
+    return [text[start:end - 1] for start, end in zip(offsets, ends)]
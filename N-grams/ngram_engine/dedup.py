@@ -0,0 +1,184 @@
+import random
+import re
+import zlib
+from operator import eq
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Estimated Jaccard similarity of 4-character shingles at or above which two
+# sentences count as near-duplicates. A one-word edit of a short sentence
+# keeps about 0.5-0.7; unrelated sentences stay far below.
+NEAR_DUPLICATE_THRESHOLD = 0.5
+# Mersenne prime modulus of the shingle hash; also marks an empty bin.
+_PRIME = (1 << 61) - 1
+_DASHES = re.compile(r"[\-–—_]+")
+_PUNCTUATION = re.compile(r"[^a-z0-9\s]")
+
+
+def shingle_hashes(text: str, size: int = 4) -> Set[int]:
+    """CRC32 of every ``size``-character shingle of the normalized text.
+
+    Normalization matches the verification report: dashes become spaces,
+    other punctuation is dropped, whitespace collapsed and case folded.
+    """
+    norm = " ".join(_PUNCTUATION.sub("", _DASHES.sub(" ", text.lower())).split())
+    if len(norm) <= size:
+        return {zlib.crc32(norm.encode("utf-8"))} if norm else set()
+    return {zlib.crc32(norm[i:i + size].encode("utf-8")) for i in range(len(norm) - size + 1)}
+
+
+class MinHashIndex:
+    """Near-duplicate lookup over MinHash signatures with LSH banding.
+
+    Every added text gets a ``num_perm``-value MinHash signature of its
+    shingles, computed with one-permutation hashing: each shingle is hashed
+    once into one of ``num_perm`` bins and every bin keeps its minimum;
+    an empty bin borrows the value of the first filled bin along its own
+    random probe order (optimal densification), so borrowed values stay
+    independent from bin to bin. The signature is cut into ``bands`` bands, and texts
+    sharing any whole band land in the same bucket. Only bucket mates are
+    compared, so adding and querying cost about the same whatever the index
+    size. With the defaults (32 bands of 3 rows) a pair at the 0.5
+    threshold shares a band with probability about 98.6%. Candidates are
+    kept when their estimated similarity reaches ``threshold``.
+    """
+
+    def __init__(
+        self,
+        threshold: float = NEAR_DUPLICATE_THRESHOLD,
+        num_perm: int = 96,
+        bands: int = 32,
+        shingle_size: int = 4,
+        seed: int = 1,
+    ):
+        if bands <= 0 or num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands}).")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        rng = random.Random(seed)
+        self._scale = rng.randrange(1, _PRIME)
+        self._shift = rng.randrange(_PRIME)
+        # Fixed random probe order per bin: an empty bin takes the value of the
+        # first filled bin in its order.
+        self._probes = [rng.sample(range(num_perm), num_perm) for _ in range(num_perm)]
+        self._buckets: List[Dict[Tuple[int, ...], List[int]]] = [{} for _ in range(bands)]
+        self.signatures: List[Optional[Tuple[int, ...]]] = []
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def signature(self, text: str) -> Optional[Tuple[int, ...]]:
+        """MinHash signature of ``text``, or None when it has no letters or digits"""
+        hashes = shingle_hashes(text, self.shingle_size)
+        if not hashes:
+            return None
+        size, scale, shift = self.num_perm, self._scale, self._shift
+        bins = [_PRIME] * size
+        for h in hashes:
+            value = (scale * h + shift) % _PRIME
+            j = value % size
+            value //= size
+            if value < bins[j]:
+                bins[j] = value
+        if _PRIME in bins:
+            filled = bins[:]
+            for j, value in enumerate(filled):
+                if value == _PRIME:
+                    for source in self._probes[j]:
+                        if filled[source] != _PRIME:
+                            bins[j] = filled[source]
+                            break
+        return tuple(bins)
+
+    def similarity(self, first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+        """Estimated Jaccard similarity of two signatures"""
+        return sum(map(eq, first, second)) / self.num_perm
+
+    def _bands(self, signature: Tuple[int, ...]) -> List[Tuple[int, Tuple[int, ...]]]:
+        """``(band, key)`` of every band used for bucketing.
+
+        A band whose bins all hold the same value (one shingle borrowed into
+        every bin) says no more than a single bin and would put most short
+        texts sharing a common shingle into one bucket, so it is skipped,
+        unless the whole text is that one shingle.
+        """
+        rows = self.rows
+        keys = [(band, signature[band * rows:(band + 1) * rows]) for band in range(self.bands)]
+        informative = [(band, key) for band, key in keys if rows == 1 or len(set(key)) > 1]
+        return informative or keys[:1]
+
+    def matches(self, signature: Optional[Tuple[int, ...]]) -> List[int]:
+        """Ids of indexed texts at or above the threshold, in insertion order"""
+        if signature is None:
+            return []
+        candidates: Set[int] = set()
+        for band, key in self._bands(signature):
+            candidates.update(self._buckets[band].get(key, ()))
+        signatures = self.signatures
+        return sorted(
+            key for key in candidates
+            if self.similarity(signature, signatures[key]) >= self.threshold
+        )
+
+    def add(self, text: str, signature: Optional[Tuple[int, ...]] = None) -> int:
+        """Index ``text`` (or its precomputed ``signature``) and return its id"""
+        if signature is None:
+            signature = self.signature(text)
+        key = len(self.signatures)
+        self.signatures.append(signature)
+        if signature is not None:
+            for band, band_key in self._bands(signature):
+                self._buckets[band].setdefault(band_key, []).append(key)
+        return key
+
+
+def near_duplicate_groups(sentences: Iterable[str], threshold: float = NEAR_DUPLICATE_THRESHOLD) -> List[List[int]]:
+    """Positions of sentences that are near-duplicates of each other, one list per group.
+
+    Matches are chained, so every sentence of a group is similar to at
+    least one other. Groups and their members are in first-seen order;
+    sentences without a near-duplicate are left out.
+    """
+    index = MinHashIndex(threshold=threshold)
+    parent: List[int] = []
+
+    def root(key: int) -> int:
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    for sentence in sentences:
+        signature = index.signature(sentence)
+        key = len(parent)
+        parent.append(key)
+        for match in index.matches(signature):
+            first, second = root(match), root(key)
+            if first != second:
+                parent[max(first, second)] = min(first, second)
+        index.add(sentence, signature)
+
+    groups: Dict[int, List[int]] = {}
+    for key in range(len(parent)):
+        groups.setdefault(root(key), []).append(key)
+    return [members for members in groups.values() if len(members) > 1]
+
+
+def drop_near_duplicates(sentences: Iterable[str], index: Optional[MinHashIndex] = None) -> List[str]:
+    """Sentences in order, skipping any that is a near-duplicate of one already kept.
+
+    Pass an ``index`` already holding earlier sentences (e.g. easier
+    sections) to drop near-duplicates of those as well; kept sentences are
+    added to it.
+    """
+    index = index if index is not None else MinHashIndex()
+    kept: List[str] = []
+    for sentence in sentences:
+        signature = index.signature(sentence)
+        if index.matches(signature):
+            continue
+        index.add(sentence, signature)
+        kept.append(sentence)
+    return kept
@@ -0,0 +1,103 @@
+import os
+import pickle
+import threading
+from typing import Dict, Optional, Tuple
+
+from .scoring import FEATURES_VERSION, word_features
+
+LEXICON_FORMAT = "ngrams-lexicon"
+DEFAULT_LEXICON_PATH = os.environ.get(
+    "NGRAMS_LEXICON",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "corpora", "lexicon.pkl"),
+)
+
+Features = Tuple[float, float, float]
+
+
+def _read_features(path: str) -> Dict[str, Features]:
+    """Features stored at ``path``; empty when the file is missing, unreadable or of another version."""
+    try:
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("format") != LEXICON_FORMAT or data.get("version") != FEATURES_VERSION:
+        return {}
+    return data.get("features", {})
+
+
+class WordLexicon:
+    """Persistent ``word -> (length, pattern, syllable)`` table.
+
+    The features depend only on the word, so they are computed once per
+    word ever and kept on disk; difficulty analysis then only computes the
+    frequency term for each corpus. The file is keyed on
+    ``FEATURES_VERSION`` and discarded when the scoring formulas change.
+    ``path=None`` keeps the lexicon in memory only.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._features: Dict[str, Features] = _read_features(path) if path else {}
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._features)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._features
+
+    def features(self, word: str) -> Features:
+        found = self._features.get(word)
+        if found is not None:
+            self.hits += 1
+            return found
+        self.misses += 1
+        self.pending += 1
+        found = self._features[word] = word_features(word)
+        return found
+
+    def save(self) -> Optional[str]:
+        """Write new words to ``path``, merged with what other processes saved meanwhile.
+
+        Returns the path written, or None when there was nothing to write
+        or the directory of ``path`` does not exist.
+        """
+        if not self.path or not self.pending:
+            return None
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.isdir(directory):
+            return None
+        with self._lock:
+            merged = _read_features(self.path)
+            merged.update(self._features)
+            self._features = merged
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as f:
+                pickle.dump(
+                    {"format": LEXICON_FORMAT, "version": FEATURES_VERSION, "features": merged},
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            os.replace(temp_path, self.path)
+            self.pending = 0
+        return self.path
+
+    def stats(self) -> Dict[str, int]:
+        return {"words": len(self._features), "hits": self.hits, "misses": self.misses, "pending": self.pending}
+
+
+_default_lexicon: Optional[WordLexicon] = None
+_default_lock = threading.Lock()
+
+
+def get_word_lexicon() -> WordLexicon:
+    """The process-wide lexicon at ``DEFAULT_LEXICON_PATH``, loaded on first use."""
+    global _default_lexicon
+    with _default_lock:
+        if _default_lexicon is None:
+            _default_lexicon = WordLexicon(DEFAULT_LEXICON_PATH)
+        return _default_lexicon
@@ -0,0 +1,130 @@
+import random
+from array import array
+from typing import Dict, List, Optional, Sequence
+
+from .compact import START, CompactModel
+from .sampler import InterpolatedSampler
+
+START_WORD_RATE = 0.3
+
+
+class MultiChainSampler:
+    """Advances many phrase chains in lock-step over one :class:`InterpolatedSampler`.
+
+    The last ``n - 1`` token ids of every chain live in one flat integer
+    array, and each step advances every live chain by one token. A context
+    is resolved straight to its model rows (an array index for the bigram
+    row, one CSR search per higher order) and its table is found by those
+    rows in a plain dict, so a step costs a few integer lookups and one
+    draw per chain, with no string handling until the phrases are
+    returned. A chain follows the same rules as
+    ``Ngrams._generate_phrase_with_model``: a random start word 30% of the
+    time, ``<END>`` only once half the target length is reached and at most
+    ``3 * target`` steps.
+    """
+
+    def __init__(self, sampler: InterpolatedSampler, n: int, cache_size: int = 50000):
+        self.sampler = sampler
+        self.cache_size = cache_size
+        self.width = max(1, n - 1)
+        model = sampler.model
+        self._start_id = model.index.get(START, -1)
+        self._start_word_ids = [model.index[word] for word in sampler.start_words]
+        self.steps = 0
+        # Context tables keyed by the model rows of each context (ids while a delta is pending).
+        self._entries: Dict[tuple, tuple] = {}
+        self._version = sampler.version
+        self._row_of: Optional[array] = None
+
+    def _initial_contexts(self, count: int, rng) -> array:
+        width = self.width
+        contexts = array("i", [self._start_id]) * (count * width)
+        start_word_ids = self._start_word_ids
+        if start_word_ids:
+            for chain in range(count):
+                if rng.random() < START_WORD_RATE:
+                    contexts[chain * width] = rng.choice(start_word_ids)
+        return contexts
+
+    def _row_index(self) -> array:
+        """Order-2 row of every vocabulary id (``-1`` when it never starts a bigram)."""
+        model = self.sampler.model
+        row_of = array("i", [-1]) * model.radix
+        for row, tok_id in enumerate(model.orders[2].keys):
+            row_of[tok_id] = row
+        return row_of
+
+    def generate(self, targets: Sequence[int], rng=random) -> List[List[str]]:
+        """One phrase (a word list, possibly empty) per target length."""
+        sampler = self.sampler
+        model = sampler.model
+        width = self.width
+        end_pos = sampler._end_pos
+        pool_ids = sampler.pool_ids
+        keep = sampler.admissible
+        draw = sampler.draw
+        entry_for_ids = sampler.entry_for_ids
+        # Rows only exist on CSR tables and do not see pending delta counts;
+        # otherwise contexts are keyed by their raw ids.
+        by_rows = isinstance(model, CompactModel) and not model.delta
+        if sampler.version != self._version:
+            self._entries.clear()
+            self._version = sampler.version
+            self._row_of = None
+        if by_rows and self._row_of is None:
+            self._row_of = self._row_index()
+        entries = self._entries
+        row_of = self._row_of
+        radix = model.radix
+        higher = [model.orders[order].find for order in range(3, min(model.n, sampler.max_order, width + 1) + 1)] if by_rows else []
+
+        count = len(targets)
+        contexts = self._initial_contexts(count, rng)
+        words: List[List[int]] = [[] for _ in range(count)]
+        steps_left = [3 * target for target in targets]
+        min_words = [max(1, target // 2) for target in targets]
+        live = [chain for chain in range(count) if targets[chain] > 0]
+
+        while live:
+            still_live: List[int] = []
+            for chain in live:
+                base = chain * width
+                end = base + width
+                if by_rows:
+                    last = contexts[end - 1]
+                    row = row_of[last] if 0 <= last < radix else -1
+                    key = (row,)
+                    if row >= 0:
+                        back = end - 2
+                        for find in higher:
+                            tok_id = contexts[back]
+                            if tok_id < 0 or tok_id >= radix:
+                                break
+                            row = find(row * radix + tok_id)
+                            if row < 0:
+                                break
+                            key += (row,)
+                            back -= 1
+                else:
+                    key = tuple(contexts[base:end])
+                entry = entries.get(key)
+                if entry is None:
+                    if len(entries) >= self.cache_size:
+                        entries.clear()
+                    entry = entries[key] = entry_for_ids(contexts[base:end])
+                chain_words = words[chain]
+                pos = draw(None, rng, len(chain_words) >= min_words[chain], entry)
+                steps_left[chain] -= 1
+                if pos is None or pos == end_pos:
+                    continue
+                if keep[pos]:
+                    chain_words.append(pos)
+                contexts[base:end - 1] = contexts[base + 1:end]
+                contexts[end - 1] = pool_ids[pos]
+                if len(chain_words) < targets[chain] and steps_left[chain] > 0:
+                    still_live.append(chain)
+            self.steps += len(live)
+            live = still_live
+
+        pool = sampler.pool
+        return [[pool[pos] for pos in chain_words] for chain_words in words]
@@ -0,0 +1,102 @@
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .compact import END, START, CompactModel, _count_edges, _finalize, build_compact_model
+
+# Below this many tokens shipping the shards to worker processes costs more
+# than counting them in the calling process.
+PARALLEL_BUILD_MIN_TOKENS = 1 << 20
+
+
+def split_sentences(tokens: Sequence[str], shards: int) -> List[Sequence[str]]:
+    """Cut ``tokens`` into at most ``shards`` runs of similar size, each ending right after an ``<END>``.
+
+    Counting drops its context after every ``<END>``, so the runs counted
+    one by one see exactly the contexts a single pass over ``tokens`` sees.
+    """
+    size = len(tokens)
+    step = max(1, size // max(1, shards))
+    bounds = [0]
+    while len(bounds) < shards:
+        try:
+            cut = tokens.index(END, bounds[-1] + step - 1) + 1
+        except ValueError:
+            break
+        if cut >= size:
+            break
+        bounds.append(cut)
+    bounds.append(size)
+    return [tokens[start:stop] for start, stop in zip(bounds, bounds[1:])]
+
+
+def _shard_vocabulary(tokens: Sequence[str]) -> List[str]:
+    """Counted tokens of a shard in first-seen order, as ``_iter_positions`` interns them."""
+    return list(dict.fromkeys(tok for tok in tokens if tok == END or tok.isalpha()))
+
+
+def _count_shard(task: Tuple[Sequence[str], int, List[str]]) -> Tuple[array, Dict[int, Dict[int, int]]]:
+    tokens, n, vocab = task
+    index = {tok: i for i, tok in enumerate(vocab)}
+    unigram = array("i", [0]) * len(vocab)
+    return unigram, _count_edges(tokens, n, list(vocab), index, unigram)
+
+
+def _merge_counts(target: Dict[int, int], extra: Dict[int, int]) -> None:
+    # Most high-order edges occur in one shard only; let dict.update copy
+    # those and add up just the overlap.
+    overlap = {edge: target[edge] for edge in target.keys() & extra.keys()}
+    target.update(extra)
+    for edge, count in overlap.items():
+        target[edge] += count
+
+
+def build_compact_model_parallel(
+    tokens: Sequence[str],
+    n: int,
+    workers: Optional[int] = None,
+    min_tokens: int = PARALLEL_BUILD_MIN_TOKENS,
+) -> CompactModel:
+    """Build the same model as :func:`build_compact_model` on a process pool.
+
+    The token list is split at sentence boundaries into one shard per
+    worker. A first pass collects each shard's vocabulary so the ids can be
+    assigned in the serial first-seen order; the workers then count their
+    shards against those ids and the partial tables are summed. The
+    finalized model is identical to the serial one, array for array.
+    Lists shorter than ``min_tokens`` are counted in this process.
+    """
+    n = max(2, int(n))
+    workers = max(1, workers or os.cpu_count() or 1)
+    shards = split_sentences(tokens, workers) if len(tokens) >= min_tokens else [tokens]
+    if len(shards) < 2:
+        return build_compact_model(tokens, n)
+
+    vocab: List[str] = [START]
+    with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+        seen = {START}
+        for shard_vocab in pool.map(_shard_vocabulary, shards):
+            for tok in shard_vocab:
+                if tok not in seen:
+                    seen.add(tok)
+                    vocab.append(tok)
+        partials = pool.map(_count_shard, [(shard, n, vocab) for shard in shards])
+
+        unigram = array("i", [0]) * len(vocab)
+        edge_counts: Dict[int, Dict[int, int]] = {}
+        for shard_unigram, shard_edges in partials:
+            for tok_id, count in enumerate(shard_unigram):
+                if count:
+                    unigram[tok_id] += count
+            for order, bucket in shard_edges.items():
+                if order in edge_counts:
+                    _merge_counts(edge_counts[order], bucket)
+                else:
+                    edge_counts[order] = bucket
+
+    if END not in seen:
+        vocab.append(END)
+        unigram.append(1)
+
+    return _finalize(vocab, unigram, edge_counts)
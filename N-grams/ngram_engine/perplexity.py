@@ -0,0 +1,86 @@
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+from .compact import END, START, CompactModel
+
+
+@dataclass
+class PhraseScore:
+    """Log-probability (natural log) of a phrase and its per-token perplexity.
+
+    ``tokens`` counts the scored words plus the closing ``<END>``.
+    """
+
+    phrase: str
+    log_prob: float
+    perplexity: float
+    tokens: int
+
+
+class PhraseScorer:
+    """Scores word sequences under the same interpolation the sampler draws from.
+
+    A token's probability is the ``lambdas``-weighted sum of its relative
+    frequency in every context order the model has seen, the unigram term
+    add-one smoothed so unknown words still get a finite score. Orders whose
+    context was never seen contribute nothing, just as they add no boost
+    when sampling. Phrases are encoded to ids first and the per-context
+    successor tables are cached, so a batch touches each distinct context
+    of the model once.
+    """
+
+    def __init__(self, model: CompactModel, lambdas: Dict[int, float], cache_size: int = 50000):
+        self.model = model
+        self.version = model.version
+        self.lambdas = lambdas
+        self.max_order = max(lambdas)
+        self.width = max(1, min(model.n, self.max_order) - 1)
+        self.cache_size = cache_size
+        vocab_size = len(model.vocab)
+        self._unigram_weight = lambdas.get(1, 0.0) / (model.total_unigrams + vocab_size + 1)
+        self._start_id = model.index.get(START, -1)
+        self._end_id = model.index.get(END, -1)
+        self._tables: Dict[Tuple[int, ...], List[Tuple[float, Dict[int, int]]]] = {}
+
+    def _context_tables(self, ctx: Tuple[int, ...]) -> List[Tuple[float, Dict[int, int]]]:
+        tables = self._tables.get(ctx)
+        if tables is None:
+            if len(self._tables) >= self.cache_size:
+                self._tables.clear()
+            tables = []
+            for order, total, ids, counts in self.model.context_counts(ctx, max_order=self.max_order):
+                weight = self.lambdas.get(order, 0.0)
+                if weight > 0:
+                    tables.append((weight / (total or 1), dict(zip(ids, counts))))
+            self._tables[ctx] = tables
+        return tables
+
+    def log_prob_ids(self, ids: Sequence[int]) -> float:
+        """Natural-log probability of ``ids`` followed by ``<END>``, from a padded ``<START>`` context"""
+        unigram = self.model.unigram
+        unigram_weight = self._unigram_weight
+        width = self.width
+        ctx = (self._start_id,) * width
+        log_prob = 0.0
+        for tok_id in list(ids) + [self._end_id]:
+            count = unigram[tok_id] if tok_id >= 0 else 0
+            prob = unigram_weight * (count + 1)
+            if tok_id >= 0:
+                for weight, successors in self._context_tables(ctx):
+                    prob += weight * successors.get(tok_id, 0)
+            log_prob += math.log(prob)
+            ctx = (ctx + (tok_id,))[-width:]
+        return log_prob
+
+    def score(self, phrases: Sequence[Sequence[str]], labels: Sequence[str] = ()) -> List[PhraseScore]:
+        """One :class:`PhraseScore` per word list, labelled by ``labels`` (or the joined words)."""
+        index = self.model.index
+        encoded = [[index.get(word, -1) for word in words] for words in phrases]
+        results: List[PhraseScore] = []
+        for i, ids in enumerate(encoded):
+            label = labels[i] if i < len(labels) else " ".join(phrases[i])
+            log_prob = self.log_prob_ids(ids)
+            tokens = len(ids) + 1
+            results.append(PhraseScore(label, log_prob, math.exp(-log_prob / tokens), tokens))
+        return results
@@ -0,0 +1,82 @@
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, Iterator, Optional
+
+# Shared no-op context used by Ngrams when profiling is off.
+NO_STAGE = nullcontext()
+
+
+class GenerationProfiler:
+    """Collects per-stage wall time and sampling counters for ``Ngrams``.
+
+    ``callback(kind, name, value)`` is invoked for every record as it
+    happens: ``("stage", name, seconds)``, ``("count", name, increment)``
+    or ``("observe", name, value)``.
+    """
+
+    def __init__(self, callback: Optional[Callable[[str, str, float], None]] = None):
+        self.callback = callback
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stages: Dict[str, Dict[str, float]] = {}
+            self.counters: Dict[str, int] = {}
+            self.observations: Dict[str, Dict[str, float]] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(name, time.perf_counter() - start)
+
+    def record_stage(self, name: str, seconds: float) -> None:
+        with self._lock:
+            stage = self.stages.setdefault(name, {"calls": 0, "total_s": 0.0, "max_s": 0.0})
+            stage["calls"] += 1
+            stage["total_s"] += seconds
+            stage["max_s"] = max(stage["max_s"], seconds)
+        if self.callback is not None:
+            self.callback("stage", name, seconds)
+
+    def count(self, name: str, increment: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + increment
+        if self.callback is not None:
+            self.callback("count", name, increment)
+
+    def observe(self, name: str, value: float) -> None:
+        with self._lock:
+            obs = self.observations.setdefault(name, {"count": 0, "total": 0.0, "min": value, "max": value})
+            obs["count"] += 1
+            obs["total"] += value
+            obs["min"] = min(obs["min"], value)
+            obs["max"] = max(obs["max"], value)
+        if self.callback is not None:
+            self.callback("observe", name, value)
+
+    def _rate(self, name: str, per: str) -> float:
+        total = self.counters.get(per, 0)
+        return self.counters.get(name, 0) / total if total else 0.0
+
+    def stats(self) -> dict:
+        with self._lock:
+            stages = {name: dict(stage, mean_s=stage["total_s"] / stage["calls"]) for name, stage in self.stages.items()}
+            observations = {name: dict(obs, mean=obs["total"] / obs["count"]) for name, obs in self.observations.items()}
+            return {
+                "stages": stages,
+                "counters": dict(self.counters),
+                "observations": observations,
+                "rates": {
+                    "retry": self._rate("retries", "attempts"),
+                    "empty": self._rate("empty_phrases", "attempts"),
+                    "fallback": self._rate("fallbacks", "slots"),
+                    "variation": self._rate("variations", "slots"),
+                    "miss": self._rate("misses", "slots"),
+                    "rejected_token": self._rate("rejected_tokens", "steps"),
+                },
+            }
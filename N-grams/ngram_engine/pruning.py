@@ -0,0 +1,199 @@
+import heapq
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from .compact import _ID_BITS, CompactModel, _finalize
+
+# Bytes per CSR context row (int64 key, offset, total) and per successor edge (id, count).
+_CONTEXT_BYTES = 16
+_EDGE_BYTES = 8
+
+
+@dataclass
+class PruningPolicy:
+    """How to shrink a built model.
+
+    ``min_count`` maps an order to the smallest successor count it keeps,
+    ``top_k`` keeps only the most frequent successors of every context and
+    ``drop_singletons`` removes order-3+ contexts seen exactly once. With a
+    ``memory_budget`` (bytes) the minimum counts of the highest orders are
+    raised further until the model fits, and the model is then filled back
+    up to just under the budget (see :func:`_fit_budget`).
+    """
+
+    min_count: Dict[int, int] = field(default_factory=dict)
+    top_k: Optional[int] = None
+    drop_singletons: bool = False
+    memory_budget: Optional[int] = None
+
+    def key(self) -> tuple:
+        return (tuple(sorted(self.min_count.items())), self.top_k, self.drop_singletons, self.memory_budget)
+
+
+def _prune_edges(
+    model: CompactModel,
+    raw_contexts: Dict[int, List[int]],
+    policy: PruningPolicy,
+    min_count: Dict[int, int],
+    relaxed: Optional[Tuple[int, int, Set[int]]] = None,
+) -> Tuple[Dict[int, Dict[int, int]], int]:
+    """Kept edge counts per order and the byte size they will finalize to.
+
+    An order-k context survives only if its order-(k-1) suffix did, so every
+    context that is kept can still be keyed and reached by the lookups.
+    ``relaxed=(order, threshold, rows)`` applies ``threshold`` instead of
+    ``min_count`` to those rows of that order.
+    """
+    edge_counts: Dict[int, Dict[int, int]] = {}
+    size = len(model.unigram) * 4
+    kept_suffixes: Optional[Set[int]] = None
+    for order in sorted(model.orders):
+        table = model.orders[order]
+        offsets, successors, counts, totals = table.offsets, table.successors, table.counts, table.totals
+        threshold = min_count.get(order, 1)
+        relaxed_threshold, relaxed_rows = (relaxed[1], relaxed[2]) if relaxed and relaxed[0] == order else (threshold, ())
+        suffix_mask = (1 << (_ID_BITS * (order - 2))) - 1
+        bucket: Dict[int, int] = {}
+        kept: Set[int] = set()
+        for row, raw_ctx in enumerate(raw_contexts[order]):
+            if kept_suffixes is not None and (raw_ctx & suffix_mask) not in kept_suffixes:
+                continue
+            if policy.drop_singletons and order > 2 and totals[row] <= 1:
+                continue
+            row_threshold = relaxed_threshold if row in relaxed_rows else threshold
+            pairs = [
+                (counts[i], successors[i])
+                for i in range(offsets[row], offsets[row + 1])
+                if counts[i] >= row_threshold
+            ]
+            if policy.top_k is not None and len(pairs) > policy.top_k:
+                pairs = heapq.nlargest(policy.top_k, pairs, key=lambda pair: (pair[0], -pair[1]))
+            if not pairs:
+                continue
+            kept.add(raw_ctx)
+            for count, tok_id in pairs:
+                bucket[(raw_ctx << _ID_BITS) | tok_id] = count
+            size += _CONTEXT_BYTES + _EDGE_BYTES * len(pairs)
+        size += 4
+        edge_counts[order] = bucket
+        kept_suffixes = kept
+    return edge_counts, size
+
+
+def _first_fitting(
+    model: CompactModel,
+    raw_contexts: Dict[int, List[int]],
+    policy: PruningPolicy,
+    min_count: Dict[int, int],
+    order: int,
+    thresholds: List[int],
+    budget: int,
+) -> Optional[Tuple[int, Dict[int, int], Dict[int, Dict[int, int]], int]]:
+    """Index of the smallest of the ascending ``thresholds`` for ``order`` that fits, with its pruning.
+
+    The size only shrinks as a threshold grows, so this is a binary search.
+    """
+    best = None
+    lo, hi = 0, len(thresholds) - 1
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        trial = {**min_count, order: thresholds[mid]}
+        trial_edges, trial_size = _prune_edges(model, raw_contexts, policy, trial)
+        if trial_size <= budget:
+            best = (mid, trial, trial_edges, trial_size)
+            hi = mid - 1
+        else:
+            lo = mid + 1
+    return best
+
+
+def _fit_budget(
+    model: CompactModel,
+    raw_contexts: Dict[int, List[int]],
+    policy: PruningPolicy,
+    min_count: Dict[int, int],
+    budget: int,
+) -> Tuple[Dict[int, int], Optional[dict], Dict[int, Dict[int, int]], int]:
+    """Minimum counts that fit ``budget``, the relaxed rows, the kept edges and their size.
+
+    The threshold of the highest order is raised to the smallest count that
+    fits (or past its largest count), then that of the order below, and so
+    on. A threshold step can drop most of an order at once (in a corpus of
+    singletons the first step drops all of it), so the result is then
+    filled back up: the orders above the last one raised get the lowest
+    threshold that still fits now that fewer of their suffixes survive, and
+    the most frequent contexts of the last order raised keep their
+    successors at its previous threshold, as many as fit.
+    """
+    floor = dict(min_count)
+    cut = None
+    for order in sorted(model.orders, reverse=True):
+        counts = model.orders[order].counts
+        if not len(counts):
+            continue
+        current = min_count.get(order, 1)
+        thresholds = sorted(c for c in set(counts) if c > current) + [max(counts) + 1]
+        found = _first_fitting(model, raw_contexts, policy, min_count, order, thresholds, budget)
+        if found is None:
+            min_count[order] = thresholds[-1]
+            continue
+        index, min_count, edge_counts, size = found
+        cut = (order, thresholds[index - 1] if index else current)
+        break
+    if cut is None:
+        edge_counts, size = _prune_edges(model, raw_contexts, policy, min_count)
+        return min_count, None, edge_counts, size
+
+    cut_order, previous = cut
+    for order in sorted(o for o in model.orders if o > cut_order):
+        lowest = floor.get(order, 1)
+        thresholds = sorted({lowest} | {c for c in set(model.orders[order].counts) if lowest < c < min_count[order]})
+        found = _first_fitting(model, raw_contexts, policy, min_count, order, thresholds, budget)
+        if found is not None:
+            _index, min_count, edge_counts, size = found
+
+    totals = model.orders[cut_order].totals
+    ranked = sorted(range(len(totals)), key=lambda row: -totals[row])
+    lo, hi = 1, len(ranked)
+    relaxed = None
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        rows = set(ranked[:mid])
+        trial_edges, trial_size = _prune_edges(model, raw_contexts, policy, min_count, (cut_order, previous, rows))
+        if trial_size <= budget:
+            relaxed = {"order": cut_order, "min_count": previous, "contexts": mid}
+            edge_counts, size = trial_edges, trial_size
+            lo = mid + 1
+        else:
+            hi = mid - 1
+    return min_count, relaxed, edge_counts, size
+
+
+def prune_model(model: CompactModel, policy: PruningPolicy) -> CompactModel:
+    """Return a pruned copy of ``model``; ``pruning_stats`` records the savings.
+
+    Totals are recomputed from the surviving counts, so every order still
+    holds proper conditional distributions for the interpolation, and the
+    unigram table is never pruned.
+    """
+    model.compact()
+    raw_contexts = model._raw_contexts()
+    min_count = dict(policy.min_count)
+    edge_counts, size = _prune_edges(model, raw_contexts, policy, min_count)
+    relaxed = None
+    budget = policy.memory_budget
+    if budget is not None and size > budget:
+        min_count, relaxed, edge_counts, size = _fit_budget(model, raw_contexts, policy, min_count, budget)
+
+    pruned = _finalize(model.vocab, model.unigram, edge_counts)
+    pruned.pruning_stats = {
+        "bytes_before": model.nbytes,
+        "bytes_after": pruned.nbytes,
+        "memory_budget": policy.memory_budget,
+        "min_count": min_count,
+        "orders_before": model.order_sizes(),
+        "orders_after": pruned.order_sizes(),
+    }
+    if relaxed is not None:
+        pruned.pruning_stats["relaxed"] = relaxed
+    return pruned
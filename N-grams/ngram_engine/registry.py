@@ -0,0 +1,134 @@
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple, Union
+
+from .shards import expand_corpus_paths
+
+DEFAULT_CACHE_SIZE = 8
+
+
+@dataclass
+class ModelEntry:
+    tokens: List[str]
+    model: Any
+    sampler: Any = None
+    corpus_stats: Any = None
+    # Bumped on every update, which publishes a new entry.
+    version: int = 0
+
+
+def corpus_fingerprint(corpus_file: Union[str, List[str], Tuple[str, ...]]) -> Tuple[Tuple[str, Optional[int], Optional[int]], ...]:
+    """(path, mtime_ns, size) for every corpus file; missing files keep ``None``.
+
+    Glob patterns are expanded, so adding or removing a shard changes the key.
+    """
+    paths = expand_corpus_paths(corpus_file)
+    fingerprint = []
+    for path in paths:
+        path = str(path)
+        try:
+            st = os.stat(path)
+            fingerprint.append((os.path.abspath(path), st.st_mtime_ns, st.st_size))
+        except OSError:
+            fingerprint.append((os.path.abspath(path), None, None))
+    return tuple(fingerprint)
+
+
+class ModelRegistry:
+    """Process-wide LRU cache of built n-gram models.
+
+    Keys are built by the caller (corpus fingerprint, difficulty, order...);
+    a changed corpus file gets a new fingerprint, so stale entries simply
+    age out of the cache. Entries put with ``pin=True`` hold updates that a
+    rebuild from the corpus would lose, so they are never evicted; they
+    leave the cache only through ``pop`` or ``clear``.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE):
+        self.max_size = max(1, int(max_size))
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._pinned: Set[Hashable] = set()
+        self._lock = threading.Lock()
+        # Held by writers for a whole copy-update-put of an entry, so
+        # concurrent updates of one model never drop each other's counts.
+        self.update_lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_build(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+
+        value = build()
+
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key]
+            self._entries[key] = value
+            self._evict()
+        return value
+
+    def put(self, key: Hashable, value: Any, pin: bool = False) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if pin:
+                self._pinned.add(key)
+            self._evict()
+
+    def pop(self, key: Hashable) -> Any:
+        with self._lock:
+            self._pinned.discard(key)
+            return self._entries.pop(key, None)
+
+    def is_pinned(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._pinned
+
+    def _evict(self) -> None:
+        excess = len(self._entries) - self.max_size
+        if excess <= 0:
+            return
+        for key in [key for key in self._entries if key not in self._pinned][:excess]:
+            del self._entries[key]
+            self.evictions += 1
+
+    def resize(self, max_size: int) -> None:
+        with self._lock:
+            self.max_size = max(1, int(max_size))
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._pinned.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "pinned": len(self._pinned),
+                "max_size": self.max_size,
+            }
+
+
+_default_registry = ModelRegistry(int(os.environ.get("NGRAMS_MODEL_CACHE_SIZE", DEFAULT_CACHE_SIZE)))
+
+
+def get_model_registry() -> ModelRegistry:
+    return _default_registry
+
+
+def configure_model_registry(max_size: int) -> ModelRegistry:
+    _default_registry.resize(max_size)
+    return _default_registry
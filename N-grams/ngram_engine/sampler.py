@@ -0,0 +1,208 @@
+import random
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from itertools import accumulate
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from .compact import END, CompactModel
+
+# The linear sampler drew a fresh temperature in [1.2, 1.5] every step; a few
+# fixed buckets let every table below be computed once per model.
+TEMPERATURE_BUCKETS: Tuple[float, ...] = (1.2, 1.3, 1.4, 1.5)
+# Expected value of the random.uniform(0, 0.01) jitter added to every candidate.
+NOISE_FLOOR = 0.005
+RANDOM_PICK_RATE = 0.1
+MAX_REJECTIONS = 32
+
+
+def _easy_length(length: int) -> bool:
+    return length <= 4
+
+
+def _medium_length(length: int) -> bool:
+    return 5 <= length <= 7
+
+
+def _hard_length(length: int) -> bool:
+    return length >= 8
+
+
+# One shared function per difficulty, so models can cache vocabulary masks by rule.
+LENGTH_RULES: Dict[str, Callable[[int], bool]] = {
+    "easy": _easy_length,
+    "medium": _medium_length,
+    "hard": _hard_length,
+}
+
+
+def length_rule(difficulty: str) -> Callable[[int], bool]:
+    return LENGTH_RULES.get(difficulty, _hard_length)
+
+
+class InterpolatedSampler:
+    """Draws next tokens from an interpolated n-gram model in O(log V) per step.
+
+    Every admissible token gets a context-independent "background" score
+    (unigram term plus noise floor). Only the successors of the current
+    context differ from it, so each context stores a small cumulative table
+    for those successors and everything else is drawn from one shared
+    cumulative array with bisect, rejecting tokens the context already covers.
+
+    Only admissible tokens (letters within the length rule, plus ``<END>``)
+    are ever drawn. ``<END>`` sits last in the pool and in every context
+    table, so ``sample(..., allow_end=False)`` draws from the same tables
+    with their last entry cut off instead of rejecting early ends.
+    """
+
+    def __init__(
+        self,
+        model: CompactModel,
+        lambdas: Dict[int, float],
+        in_length_range_fn: Callable[[int], bool],
+        temperatures: Sequence[float] = TEMPERATURE_BUCKETS,
+        context_cache_size: int = 20000,
+    ):
+        vocab = model.vocab
+        candidates = [tok_id for tok_id, count in enumerate(model.unigram) if count]
+        mask = model.vocab_mask(in_length_range_fn, lambda tok: tok == END or (tok.isalpha() and in_length_range_fn(len(tok))))
+        good_ids = [tok_id for tok_id in candidates if mask[tok_id]]
+        # Everything drawn from a filtered pool is admissible without rechecking.
+        self.filtered = bool(good_ids)
+        pool_ids = good_ids if good_ids else candidates
+        end_id = model.index.get(END, -1)
+        if end_id in pool_ids:
+            pool_ids = [tok_id for tok_id in pool_ids if tok_id != end_id] + [end_id]
+        self.model = model
+        self.version = model.version
+        self.pool: List[str] = [vocab[tok_id] for tok_id in pool_ids]
+        self.pool_ids = array("i", pool_ids)
+        # Pool positions a phrase may keep (everything but <END> in a filtered pool).
+        self.admissible = bytearray(
+            1 if tok != END and (self.filtered or (tok.isalpha() and in_length_range_fn(len(tok)))) else 0
+            for tok in self.pool
+        )
+        self.start_words: List[str] = [vocab[tok_id] for tok_id in candidates if vocab[tok_id].isalpha()]
+        self.lambdas = lambdas
+        self.max_order = max(lambdas)
+        self.temperatures = tuple(temperatures)
+        self._exponents = [1.0 / t for t in self.temperatures]
+        self._position = array("i", [-1]) * len(vocab)
+        for pos, tok_id in enumerate(pool_ids):
+            self._position[tok_id] = pos
+        self._end_pos = len(pool_ids) - 1 if end_id in pool_ids else -1
+
+        total_unigrams = model.total_unigrams or 1
+        unigram_weight = lambdas.get(1, 0.0)
+        self._base = [unigram_weight * (model.unigram[tok_id] / total_unigrams) + NOISE_FLOOR for tok_id in pool_ids]
+        self._background = [list(accumulate(b ** exp for b in self._base)) for exp in self._exponents]
+
+        self._context_cache: "OrderedDict[Tuple[str, ...], tuple]" = OrderedDict()
+        self._row_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._context_cache_size = context_cache_size
+
+    def _context_boosts(self, ctx_counts) -> Dict[int, float]:
+        boosts: Dict[int, float] = {}
+        position = self._position
+        for order, total, ids, counts in ctx_counts:
+            weight = self.lambdas.get(order, 0.0)
+            if weight <= 0:
+                continue
+            weight /= total or 1
+            for tok_id, count in zip(ids, counts):
+                pos = position[tok_id]
+                if pos >= 0:
+                    boosts[pos] = boosts.get(pos, 0.0) + weight * count
+        return boosts
+
+    def _build_entry(self, ctx_counts) -> Tuple[List[int], Set[int], List[Tuple[List[float], float, float]]]:
+        boosts = self._context_boosts(ctx_counts)
+        end_pos = self._end_pos
+        ids = [i for i in boosts if i != end_pos]
+        if end_pos in boosts:
+            ids.append(end_pos)
+        tables = []
+        for exp, background in zip(self._exponents, self._background):
+            cum = list(accumulate((self._base[i] + boosts[i]) ** exp for i in ids))
+            if len(ids) == len(self.pool):
+                rest = 0.0
+            else:
+                rest = max(0.0, background[-1] - sum(self._base[i] ** exp for i in ids))
+            # Background mass left once <END> is excluded as well.
+            rest_no_end = rest
+            if end_pos >= 0 and end_pos not in boosts:
+                rest_no_end = max(0.0, rest - self._base[end_pos] ** exp)
+            tables.append((cum, rest, rest_no_end))
+        return ids, set(ids), tables
+
+    def entry_for_ids(self, ctx_ids: Sequence[int]) -> Tuple[List[int], Set[int], List[Tuple[List[float], float, float]]]:
+        """Context table for a context given as vocabulary ids (``-1`` for unknown tokens).
+
+        A table only depends on which context rows the model has, so contexts
+        that back off to the same rows share one cached table. Pending delta
+        counts are part of the key, as contexts sharing base rows can differ
+        in them.
+        """
+        model = self.model
+        rows = tuple(model.context_rows(ctx_ids, max_order=self.max_order))
+        if model.delta:
+            rows = (rows, model.delta_contexts(ctx_ids, max_order=self.max_order))
+        cache = self._row_cache
+        entry = cache.get(rows)
+        if entry is not None:
+            cache.move_to_end(rows)
+            return entry
+        entry = cache[rows] = self._build_entry(model.context_counts(ctx_ids, max_order=self.max_order))
+        if len(cache) > self._context_cache_size:
+            cache.popitem(last=False)
+        return entry
+
+    def _context_entry(self, ctx: Tuple[str, ...]) -> Tuple[List[int], Set[int], List[Tuple[List[float], float, float]]]:
+        entry = self._context_cache.get(ctx)
+        if entry is not None:
+            self._context_cache.move_to_end(ctx)
+            return entry
+
+        entry = self.entry_for_ids(self.model.context_ids(ctx))
+        self._context_cache[ctx] = entry
+        if len(self._context_cache) > self._context_cache_size:
+            self._context_cache.popitem(last=False)
+        return entry
+
+    def sample(self, ctx: Tuple[str, ...], rng=random, allow_end: bool = True) -> Optional[str]:
+        pos = self.draw(ctx, rng, allow_end)
+        return None if pos is None else self.pool[pos]
+
+    def draw(self, ctx, rng=random, allow_end: bool = True, entry=None) -> Optional[int]:
+        """Pool position of the next token; ``entry`` skips the lookup of ``ctx``."""
+        pool = self.pool
+        exclude_end = not allow_end and self._end_pos >= 0
+        size = len(pool) - 1 if exclude_end else len(pool)
+        if size <= 0:
+            return None
+        if rng.random() < RANDOM_PICK_RATE:
+            return rng.randrange(size)
+
+        bucket = rng.randrange(len(self.temperatures))
+        ids, members, tables = entry if entry is not None else self._context_entry(ctx)
+        cum, rest, rest_no_end = tables[bucket]
+        n_ids = len(ids)
+        if exclude_end:
+            rest = rest_no_end
+            if n_ids and ids[-1] == self._end_pos:
+                n_ids -= 1
+        context_mass = cum[n_ids - 1] if n_ids else 0.0
+        r = rng.random() * (context_mass + rest)
+        if r < context_mass:
+            return ids[min(bisect_right(cum, r, 0, n_ids), n_ids - 1)]
+
+        background = self._background[bucket]
+        total = background[size - 1]
+        for _ in range(MAX_REJECTIONS):
+            i = min(bisect_right(background, rng.random() * total, 0, size), size - 1)
+            if i not in members:
+                return i
+        outside = [i for i in range(size) if i not in members]
+        if outside:
+            return rng.choice(outside)
+        return ids[n_ids - 1] if n_ids else None
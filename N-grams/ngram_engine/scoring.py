@@ -0,0 +1,95 @@
+import re
+from typing import Callable, Dict, List, Mapping, Tuple
+
+VOWELS = "aeiou"
+# Version of the corpus-independent word features; bump it whenever
+# length_score, pattern_score or syllable_score changes so persisted
+# lexicons built with the old formulas are discarded.
+FEATURES_VERSION = 1
+# Cut points of the easy/medium/hard split, as fractions of the ranked vocabulary.
+EASY_PERCENTILE = 0.4
+MEDIUM_PERCENTILE = 0.8
+
+_VOWEL_RUN = re.compile(f"[{VOWELS}]+")
+
+
+def length_score(word: str) -> float:
+    return len(word) * 0.3
+
+
+def pattern_score(word: str) -> float:
+    """0.5 per non-letter plus 1.0 for every consonant from the third in a row on"""
+    lowered = word.lower()
+    if lowered.isalpha():
+        return float(sum(max(0, len(run) - 2) for run in _VOWEL_RUN.split(lowered)))
+    score = 0.0
+    consonants = 0
+    for char in lowered:
+        if char in VOWELS:
+            consonants = 0
+        elif char.isalpha():
+            consonants += 1
+            if consonants >= 3:
+                score += 1.0
+        else:
+            score += 0.5
+    return score
+
+
+def syllable_score(word: str) -> float:
+    lowered = word.lower()
+    if lowered.isalpha():
+        letters = len(lowered)
+    else:
+        letters = sum(1 for char in lowered if char.isalpha())
+    return max(1, letters // 3) * 0.5
+
+
+def word_features(word: str) -> Tuple[float, float, float]:
+    """The corpus-independent (length, pattern, syllable) scores of ``word``"""
+    return length_score(word), pattern_score(word), syllable_score(word)
+
+
+def score_vocabulary(
+    word_counts: Mapping[str, int],
+    features: Callable[[str], Tuple[float, float, float]] = word_features,
+) -> Dict[str, float]:
+    """Complexity score of every word of two or more characters.
+
+    The corpus size is summed once for the whole batch instead of once per
+    word; the float terms are added in the same order as the per-word scorer.
+    ``features`` supplies the (length, pattern, syllable) scores, e.g. from a
+    :class:`~ngram_engine.lexicon.WordLexicon`; only the frequency term
+    depends on the corpus.
+    """
+    total_words = sum(word_counts.values())
+    scores: Dict[str, float] = {}
+    for word, count in word_counts.items():
+        if len(word) < 2:
+            continue
+        length, pattern, syllable = features(word)
+        scores[word] = length + (1 - (count / total_words)) * 5 + pattern + syllable
+    return scores
+
+
+def categorize_by_rank(
+    word_scores: Mapping[str, float],
+    easy_fraction: float = EASY_PERCENTILE,
+    medium_fraction: float = MEDIUM_PERCENTILE,
+) -> Dict[str, str]:
+    """Label the lowest-scoring 40% easy, the next 40% medium and the rest hard.
+
+    Ties keep vocabulary order, and the result is ordered by score so the
+    first words of each label are its easiest ones.
+    """
+    words: List[str] = list(word_scores)
+    total = len(words)
+    easy_cut = int(total * easy_fraction)
+    medium_cut = int(total * medium_fraction)
+    ranked = sorted(range(total), key=list(word_scores.values()).__getitem__)
+
+    word_difficulty: Dict[str, str] = {}
+    for start, stop, label in ((0, easy_cut, "easy"), (easy_cut, medium_cut, "medium"), (medium_cut, total, "hard")):
+        for i in ranked[start:stop]:
+            word_difficulty[words[i]] = label
+    return word_difficulty
@@ -0,0 +1,51 @@
+import glob
+import os
+from typing import Iterable, Iterator, List, Sequence, Tuple, Union
+
+from .compact import END, START
+
+# Below this many characters the pickling round trip to a worker process
+# costs more than tokenizing the shards in the calling process.
+PROCESS_TOKENIZE_MIN_CHARS = 1 << 22
+MAX_LOAD_THREADS = 16
+
+
+def is_sharded(corpus_file: Union[str, Sequence[str]]) -> bool:
+    return isinstance(corpus_file, (list, tuple)) or glob.has_magic(str(corpus_file))
+
+
+def expand_corpus_paths(corpus_file: Union[str, Sequence[str]]) -> List[str]:
+    """Expand glob patterns into sorted shard paths; plain paths are kept as given"""
+    entries = corpus_file if isinstance(corpus_file, (list, tuple)) else [corpus_file]
+    paths: List[str] = []
+    for entry in entries:
+        entry = str(entry)
+        if glob.has_magic(entry):
+            paths.extend(path for path in sorted(glob.glob(entry)) if os.path.isfile(path))
+        else:
+            paths.append(entry)
+    return paths
+
+
+def ends_sentence(text: str) -> bool:
+    return text.rstrip()[-1:] in (".", "!", "?")
+
+
+def merge_shard_tokens(shards: Iterable[Tuple[List[str], bool]]) -> Iterator[str]:
+    """Chain per-shard token lists as if the shard texts had been joined with newlines.
+
+    ``shards`` yields ``(tokens, ends_sentence)`` pairs. When a shard does
+    not end with sentence punctuation its last sentence runs on into the
+    next shard, so that shard's ``<END>`` and the next one's ``<START>`` are
+    dropped, exactly as tokenizing the joined text would.
+    """
+    run_on = False
+    for tokens, closed in shards:
+        if not tokens:
+            continue
+        start = 1 if run_on and tokens[0] == START else 0
+        stop = len(tokens) - 1 if not closed and tokens[-1] == END else len(tokens)
+        yield from tokens[start:stop]
+        run_on = not closed
+    if run_on:
+        yield END
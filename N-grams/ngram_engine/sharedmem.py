@@ -0,0 +1,98 @@
+import mmap
+import os
+import sys
+from array import array
+from multiprocessing import shared_memory
+from typing import Optional, Union
+
+try:
+    # CPython's private shm_open() binding, the one SharedMemory itself uses.
+    # Python 3.13+ can skip the resource tracker publicly (track=False), so
+    # losing this binding there only costs the fallback below.
+    from _posixshmem import shm_open as _shm_open
+except ImportError:
+    _shm_open = None
+
+from .artifact import CompiledModel, artifact_blobs
+from .compact import CompactModel
+
+
+def _map_segment(name: str) -> Union[mmap.mmap, shared_memory.SharedMemory]:
+    """Read-only mapping of an existing segment.
+
+    Before Python 3.13 a POSIX segment is opened directly rather than through
+    ``SharedMemory``, which would register it with this process's resource
+    tracker (shared with forked workers) and unlink it when the process
+    exits. From 3.13 on, an untracked ``SharedMemory`` is the fallback.
+    """
+    if os.name == "posix" and _shm_open is not None:
+        try:
+            fd = _shm_open("/" + name.lstrip("/"), os.O_RDONLY, mode=0o600)
+        except TypeError:
+            # The private binding changed its signature.
+            fd = None
+        if fd is not None:
+            try:
+                return mmap.mmap(fd, os.fstat(fd).st_size, access=mmap.ACCESS_READ)
+            finally:
+                os.close(fd)
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    if os.name == "posix":
+        raise RuntimeError("Attaching a shared model needs _posixshmem.shm_open() before Python 3.13.")
+    segment = shared_memory.SharedMemory(name=name)
+    try:
+        return mmap.mmap(-1, segment.size, tagname=name, access=mmap.ACCESS_READ)
+    finally:
+        segment.close()
+
+
+class SharedModel(CompiledModel):
+    """A :class:`CompactModel` attached read-only to a published segment.
+
+    The segment holds the same layout as a compiled artifact, so the arrays
+    are views into memory shared by every attached process: attaching costs
+    one header parse, whatever the model size.
+    """
+
+    def __init__(self, name: str):
+        self.path = name
+        self._mmap = _map_segment(name)
+        buf = self._mmap.buf if isinstance(self._mmap, shared_memory.SharedMemory) else memoryview(self._mmap)
+        try:
+            self._load(buf)
+        except ValueError:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        self.orders = {}
+        self.unigram = array("i")
+        self._buf = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+
+
+def publish_model(model: CompactModel, name: Optional[str] = None, metadata: Optional[dict] = None) -> shared_memory.SharedMemory:
+    """Copy a built model into a new shared memory segment for :class:`SharedModel`.
+
+    The caller owns the segment: keep it open while workers use the model,
+    then ``close()`` and ``unlink()`` it. Pending incremental counts are
+    compacted into the published copy.
+    """
+    blobs = artifact_blobs(model, metadata)
+    segment = shared_memory.SharedMemory(name=name, create=True, size=sum(len(blob) for blob in blobs))
+    cursor = 0
+    for blob in blobs:
+        segment.buf[cursor:cursor + len(blob)] = blob
+        cursor += len(blob)
+    return segment
+
+
+def attach_model(name: str) -> SharedModel:
+    try:
+        return SharedModel(name)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Shared model segment '{name}' not found!")
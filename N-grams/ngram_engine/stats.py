@@ -0,0 +1,77 @@
+from collections import Counter
+from typing import Dict, Iterable, Iterator, Optional
+
+from .compact import END, START
+
+
+class CorpusStats:
+    """Token total and per-word counts of a corpus, gathered while it is read.
+
+    ``word_counts`` excludes ``<START>``/``<END>`` and keeps first-seen
+    order, exactly like ``Counter`` over the filtered token list.
+    ``difficulty_stats`` and ``order_sizes`` are derived from the counts
+    and the model built from them; they start as ``None`` and are dropped
+    whenever more tokens are added.
+    """
+
+    __slots__ = ("total_tokens", "word_counts", "difficulty_stats", "order_sizes")
+
+    def __init__(self):
+        self.total_tokens = 0
+        self.word_counts: Counter = Counter()
+        self.difficulty_stats: Optional[Dict[str, dict]] = None
+        self.order_sizes: Optional[Dict[int, Dict[str, int]]] = None
+
+    @classmethod
+    def from_tokens(cls, tokens: Iterable[str]) -> "CorpusStats":
+        stats = cls()
+        stats.add(tokens)
+        return stats
+
+    @classmethod
+    def from_model(cls, model) -> "CorpusStats":
+        """Stats of what a built model counted, for models that come without their corpus.
+
+        Every counted sentence adds one ``<START>``/``<END>`` pair to the
+        total; tokens the model never counts (punctuation, numbers) are
+        missing from both figures.
+        """
+        stats = cls()
+        counts = model.unigram_counts
+        sentences = counts.pop(END, 0)
+        counts.pop(START, None)
+        stats.word_counts = counts
+        stats.total_tokens = sum(counts.values()) + 2 * sentences
+        return stats
+
+    def add(self, tokens: Iterable[str]) -> None:
+        counts = Counter(tokens)
+        self.total_tokens += sum(counts.values())
+        counts.pop(START, None)
+        counts.pop(END, None)
+        self.word_counts.update(counts)
+        self.difficulty_stats = None
+        self.order_sizes = None
+
+    def copy(self) -> "CorpusStats":
+        clone = CorpusStats()
+        clone.total_tokens = self.total_tokens
+        clone.word_counts = Counter(self.word_counts)
+        return clone
+
+    def counting(self, tokens: Iterable[str]) -> Iterator[str]:
+        """Pass a token stream through unchanged while counting it."""
+        word_counts = self.word_counts
+        total = 0
+        try:
+            for tok in tokens:
+                total += 1
+                if tok != START and tok != END:
+                    word_counts[tok] += 1
+                yield tok
+        finally:
+            self.total_tokens += total
+
+    @property
+    def unique_words(self) -> int:
+        return len(self.word_counts)
@@ -0,0 +1,70 @@
+import re
+from typing import Iterable, Iterator
+
+from .compact import END, START
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+_WORD = re.compile(r"\w+|[^\w\s]")
+_LAST_SPACE = re.compile(r"\s(?=\S*$)")
+
+
+def iter_text_chunks(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, encoding: str = "utf-8") -> Iterator[str]:
+    with open(path, "r", encoding=encoding) as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def iter_string_chunks(text: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    for i in range(0, len(text), chunk_size):
+        yield text[i:i + chunk_size]
+
+
+def iter_sentence_tokens(chunks: Iterable[str], special_tokens: bool = True) -> Iterator[str]:
+    """Tokenize streamed text exactly like ``Ngrams._tokenize`` on the joined text.
+
+    Only the unfinished tail of the current sentence is carried between
+    chunks; the words of an open sentence are emitted as soon as the
+    whitespace after them has been seen, so memory stays bounded by the
+    chunk size even for text without sentence punctuation.
+    """
+    carry = ""
+    sentence_open = False
+    for chunk in chunks:
+        if not chunk:
+            continue
+        pieces = _SENTENCE_BOUNDARY.split(carry + chunk)
+        for sent in pieces[:-1]:
+            if not sentence_open:
+                if not sent.strip():
+                    continue
+                if special_tokens:
+                    yield START
+            yield from _WORD.findall(sent)
+            if special_tokens:
+                yield END
+            sentence_open = False
+
+        tail = pieces[-1]
+        match = _LAST_SPACE.search(tail)
+        if match is None:
+            carry = tail
+            continue
+        head, carry = tail[:match.start()], tail[match.end():]
+        words = _WORD.findall(head)
+        if words:
+            if not sentence_open and special_tokens:
+                yield START
+            sentence_open = True
+            yield from words
+
+    words = _WORD.findall(carry)
+    if words and not sentence_open and special_tokens:
+        yield START
+    yield from words
+    if (words or sentence_open) and special_tokens:
+        yield END
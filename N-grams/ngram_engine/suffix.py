@@ -0,0 +1,348 @@
+import sys
+from array import array
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from .compact import END, START, CompactModel
+
+# Closes every sentence in the token stream; sorts before every token id.
+_SEPARATOR = -1
+
+
+def _encode(tokens: Iterable[str], vocab: List[str], index: Dict[str, int], unigram: array, stream: array) -> int:
+    """Append the counted tokens of a stream to ``stream`` as sentences.
+
+    Follows the counting rules of ``_iter_positions``: non-alphabetic tokens
+    are dropped, a sentence opens with one ``<START>`` (also implicitly) and
+    ends after ``<END>`` or at the next ``<START>``. Returns the number of
+    counted tokens.
+    """
+    start_id = index[START]
+    counted = 0
+    open_sentence = False
+    for tok in tokens:
+        if tok == START:
+            if open_sentence and stream[-1] == start_id:
+                continue
+            if open_sentence:
+                stream.append(_SEPARATOR)
+            stream.append(start_id)
+            open_sentence = True
+            continue
+        if tok != END and not tok.isalpha():
+            continue
+        if not open_sentence:
+            stream.append(start_id)
+            open_sentence = True
+
+        tok_id = index.get(tok)
+        if tok_id is None:
+            tok_id = len(vocab)
+            index[tok] = tok_id
+            vocab.append(tok)
+            unigram.append(0)
+        unigram[tok_id] += 1
+        counted += 1
+        stream.append(tok_id)
+        if tok == END:
+            stream.append(_SEPARATOR)
+            open_sentence = False
+    if open_sentence:
+        if stream[-1] == start_id:
+            stream.pop()
+        else:
+            stream.append(_SEPARATOR)
+    return counted
+
+
+def _sort_suffixes(stream: array) -> array:
+    """Start positions of all sentence suffixes in lexicographic order.
+
+    Prefix doubling: suffixes are sorted by their first token, then by
+    their first 2, 4, ... tokens. A suffix's rank is the sorted slot where
+    its group of equal prefixes starts, so each round only re-sorts the
+    suffixes still tied with another one, keyed on the rank of their
+    second half. A suffix reads no rank past its own sentence end, which
+    ranks below every token, so a shorter suffix sorts before every
+    longer one it prefixes and identical suffixes keep stream order. Only
+    a few integer arrays the size of the stream are held, whatever the
+    sentence lengths.
+    """
+    size = len(stream)
+    ends = array("i", [0]) * size
+    end = size
+    for pos in range(size - 1, -1, -1):
+        if stream[pos] == _SEPARATOR:
+            end = pos
+        ends[pos] = end
+    positions = [pos for pos, tok_id in enumerate(stream) if tok_id != _SEPARATOR]
+    positions.sort(key=stream.__getitem__)
+    # Ranks are shifted by one so that a sentence end (rank 0) sorts first.
+    rank = array("i", [0]) * size
+    tied, groups = _rank_groups(positions, range(len(positions)), [stream[pos] for pos in positions], rank)
+    width = 1
+    while tied:
+        radix = len(positions) + 1
+        group = [positions[slot] for slot in tied]
+        keys = [
+            rank[pos] * radix + (rank[pos + width] if pos + width < ends[pos] else 0)
+            for pos in group
+        ]
+        order = sorted(range(len(group)), key=keys.__getitem__)
+        for slot, i in zip(tied, order):
+            positions[slot] = group[i]
+        still_tied, split_groups = _rank_groups(positions, tied, [keys[i] for i in order], rank)
+        # A round that splits no group means every tie is between identical
+        # suffixes: doubling further cannot split one either.
+        if split_groups == groups and len(still_tied) == len(tied):
+            break
+        tied, groups = still_tied, split_groups
+        width *= 2
+    return array("i", positions)
+
+
+def _rank_groups(positions: List[int], slots: Sequence[int], keys: Sequence[int], rank: array) -> Tuple[List[int], int]:
+    """Rank the suffixes at ``slots`` (sorted by ``keys``) by the slot their group starts at.
+
+    Returns the slots whose suffix is still tied with another one and the
+    number of groups they form.
+    """
+    tied: List[int] = []
+    groups = 0
+    count = len(slots)
+    if not count:
+        return tied, groups
+    bounds = [i for i in range(1, count) if keys[i] != keys[i - 1]]
+    bounds.append(count)
+    first = 0
+    for last in bounds:
+        group_rank = slots[first] + 1
+        if last - first == 1:
+            rank[positions[slots[first]]] = group_rank
+        else:
+            members = slots[first:last]
+            for slot in members:
+                rank[positions[slot]] = group_rank
+            tied.extend(members)
+            groups += 1
+        first = last
+    return tied, groups
+
+
+def _longest_common_prefixes(stream: array, suffixes: array) -> array:
+    """Kasai's LCP array, with comparisons stopping at sentence ends."""
+    rank = array("i", [-1]) * len(stream)
+    for i, pos in enumerate(suffixes):
+        rank[pos] = i
+    lcp = array("i", [0]) * len(suffixes)
+    h = 0
+    for pos, tok_id in enumerate(stream):
+        if tok_id == _SEPARATOR:
+            h = 0
+            continue
+        i = rank[pos]
+        if i > 0:
+            other = suffixes[i - 1]
+            while stream[pos + h] == stream[other + h] and stream[pos + h] != _SEPARATOR:
+                h += 1
+            lcp[i] = h
+            if h:
+                h -= 1
+        else:
+            h = 0
+    return lcp
+
+
+class SuffixArrayModel:
+    """N-gram counts of every order answered from one suffix array.
+
+    The counted tokens are stored once, as ids, sentence after sentence;
+    each sentence opens with a single ``<START>``. ``suffixes`` lists every
+    sentence suffix in lexicographic order and ``lcp[i]`` is the common
+    prefix length of suffixes ``i - 1`` and ``i``. The occurrences of a
+    context form one contiguous range of ``suffixes`` found by binary
+    search, and the next tokens of that range are its successors, already
+    grouped by id. Any order can be queried with memory linear in the
+    corpus; the counts equal those of a :class:`CompactModel` over the same
+    tokens, behind the same ``context_rows``/``context_counts`` lookups.
+    """
+
+    vocab_size = CompactModel.vocab_size
+    unigram_counts = CompactModel.unigram_counts
+    vocab_mask = CompactModel.vocab_mask
+    context_ids = CompactModel.context_ids
+    successors = CompactModel.successors
+    delta_contexts = CompactModel.delta_contexts
+
+    def __init__(self, vocab: List[str], unigram: array, stream: array, n: int):
+        self.vocab = vocab
+        self.index: Dict[str, int] = {tok: i for i, tok in enumerate(vocab)}
+        self.unigram = unigram
+        self.total_unigrams = sum(unigram)
+        self.stream = stream
+        self.n = n
+        self.radix = len(vocab)
+        # Nothing is ever pending: add_tokens re-indexes right away.
+        self.delta: Dict[int, Dict[int, Dict[int, int]]] = {}
+        self.delta_edges = 0
+        self.version = 0
+        self.pruning_stats: Optional[dict] = None
+        self._masks: Dict[Hashable, bytearray] = {}
+        self._index_stream()
+
+    def _index_stream(self) -> None:
+        self.suffixes = _sort_suffixes(self.stream)
+        self.lcp = _longest_common_prefixes(self.stream, self.suffixes)
+        self.radix = len(self.vocab)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(arr) * arr.itemsize for arr in (self.unigram, self.stream, self.suffixes, self.lcp))
+
+    def _find(self, query: array) -> Tuple[int, int]:
+        """Range of ``suffixes`` that start with ``query``."""
+        stream, suffixes = self.stream, self.suffixes
+        m = len(query)
+        lo, hi = 0, len(suffixes)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            pos = suffixes[mid]
+            if stream[pos:pos + m] < query:
+                lo = mid + 1
+            else:
+                hi = mid
+        first = lo
+        hi = len(suffixes)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            pos = suffixes[mid]
+            if stream[pos:pos + m] <= query:
+                lo = mid + 1
+            else:
+                hi = mid
+        return first, lo
+
+    def _next_after(self, token: int, m: int, lo: int, hi: int) -> int:
+        """First index in ``[lo, hi)`` whose token at offset ``m`` is above ``token``."""
+        stream, suffixes = self.stream, self.suffixes
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if stream[suffixes[mid] + m] <= token:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _ranges(self, ctx_ids: Sequence[int], max_order: Optional[int] = None) -> List[Tuple[int, int, int, int, int]]:
+        """``(order, length, start, first, end)`` per seen order of the context.
+
+        ``suffixes[start:end]`` holds the occurrences of the (padding-free)
+        context of that order, ``suffixes[first:end]`` those followed by a
+        token. A context that already reached the sentence start only grows
+        by more ``<START>`` padding and keeps its range.
+        """
+        top = min(max_order or self.n, len(ctx_ids) + 1)
+        start_id = self.index[START]
+        result: List[Tuple[int, int, int, int, int]] = []
+        query = array("i")
+        lo = first = hi = 0
+        for order in range(2, top + 1):
+            tok_id = ctx_ids[-(order - 1)]
+            if tok_id < 0 or tok_id >= self.radix:
+                break
+            if query and query[0] == start_id:
+                if tok_id != start_id:
+                    break
+            else:
+                query.insert(0, tok_id)
+                lo, hi = self._find(query)
+                first = self._next_after(_SEPARATOR, len(query), lo, hi)
+                if first >= hi:
+                    break
+            result.append((order, len(query), lo, first, hi))
+        return result
+
+    def context_rows(self, ctx_ids: Sequence[int], max_order: Optional[int] = None) -> List[Tuple[int, int]]:
+        """(order, row) for every order whose context was seen; a row names one suffix range."""
+        size = len(self.suffixes) + 1
+        return [(order, m * size + lo) for order, m, lo, _first, _hi in self._ranges(ctx_ids, max_order)]
+
+    def context_counts(self, ctx_ids: Sequence[int], max_order: Optional[int] = None) -> List[Tuple[int, int, Sequence[int], Sequence[int]]]:
+        """(order, total, successor ids, counts) per seen order"""
+        stream, suffixes = self.stream, self.suffixes
+        result = []
+        for order, m, _lo, first, hi in self._ranges(ctx_ids, max_order):
+            ids: List[int] = []
+            counts: List[int] = []
+            i = first
+            while i < hi:
+                tok_id = stream[suffixes[i] + m]
+                j = self._next_after(tok_id, m, i, hi)
+                ids.append(tok_id)
+                counts.append(j - i)
+                i = j
+            result.append((order, hi - first, ids, counts))
+        return result
+
+    def add_tokens(self, tokens: Iterable[str]) -> int:
+        """Append a ``<START>``/``<END>`` token stream and re-index."""
+        added = _encode(tokens, self.vocab, self.index, self.unigram, self.stream)
+        if not added:
+            return 0
+        self.total_unigrams += added
+        self._index_stream()
+        self.version += 1
+        return added
+
+    def copy(self) -> "SuffixArrayModel":
+        clone = CompactModel.copy(self)
+        clone.stream = array("i", self.stream)
+        return clone
+
+    def compact(self) -> None:
+        pass
+
+    def _distinct_prefixes(self, length: int, min_length: int) -> int:
+        """Distinct ``length``-token prefixes among suffixes of at least ``min_length`` tokens."""
+        stream, lcp = self.stream, self.lcp
+        distinct = 0
+        shared = -1
+        for i, pos in enumerate(self.suffixes):
+            if shared >= 0:
+                shared = min(shared, lcp[i])
+            if _SEPARATOR in stream[pos:pos + min_length]:
+                continue
+            if shared < 0 or shared < length:
+                distinct += 1
+            shared = sys.maxsize
+        return distinct
+
+    def order_sizes(self) -> Dict[int, Dict[str, int]]:
+        """Distinct contexts and n-grams per order up to ``n``, counted over the LCP array.
+
+        ``<START>`` padding is not repeated per order here, so the counts of
+        orders above 2 can be slightly below those of a :class:`CompactModel`.
+        """
+        return {
+            order: {
+                "contexts": self._distinct_prefixes(order - 1, order),
+                "edges": self._distinct_prefixes(order, order),
+            }
+            for order in range(2, self.n + 1)
+        }
+
+
+def build_suffix_model(tokens: Iterable[str], n: int) -> SuffixArrayModel:
+    """Index a ``<START>``/``<END>`` token stream; ``n`` is the default query order."""
+    n = max(2, int(n))
+    vocab: List[str] = [START]
+    index: Dict[str, int] = {START: 0}
+    unigram = array("i", [0])
+    stream = array("i")
+    _encode(tokens, vocab, index, unigram, stream)
+
+    if END not in index:
+        index[END] = len(vocab)
+        vocab.append(END)
+        unigram.append(1)
+
+    return SuffixArrayModel(vocab, unigram, stream, n)
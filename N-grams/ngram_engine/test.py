@@ -0,0 +1,158 @@
+import os
+import random
+import tempfile
+
+_WORDS = ("the", "cat", "sat", "on", "a", "mat", "quickly", "über", "don't", "3rd", "re-use", "Zebra", "x")
+
+
+def _sample_text(sentences: int = 400, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    parts = []
+    for _ in range(sentences):
+        words = [rng.choice(_WORDS) for _ in range(rng.randint(1, 12))]
+        parts.append(" ".join(words) + rng.choice((".", "!", "?", ",", "", " ...")))
+    return rng.choice(("\n", " ", "  \n ")).join(parts)
+
+
+def _model_arrays(model) -> dict:
+    arrays = {"vocab": list(model.vocab), "unigram": list(model.unigram)}
+    for order, table in model.orders.items():
+        for name in ("keys", "offsets", "successors", "counts", "totals"):
+            arrays[f"order{order}.{name}"] = list(getattr(table, name))
+    return arrays
+
+
+def test_streaming_matches_tokenize():
+    try:
+        from ngrams import Ngrams
+        from .streaming import iter_sentence_tokens, iter_string_chunks
+
+        texts = [
+            _sample_text(),
+            "one long sentence without any punctuation " * 50,
+            "Hello!  World?\n\nFoo. bar",
+            "  leading and trailing space.  ",
+            "?!.",
+            "",
+        ]
+        for text in texts:
+            expected = Ngrams._tokenize(text, special_tokens=True)
+            for chunk_size in (1, 2, 7, 64, 1 << 20):
+                streamed = list(iter_sentence_tokens(iter_string_chunks(text, chunk_size)))
+                if streamed != expected:
+                    print(f"❌ Streamed tokens differ from _tokenize (chunk size {chunk_size}, text {text[:30]!r})")
+                    return False
+        print("✅ Streaming tokenizer matches _tokenize")
+        return True
+    except Exception as e:
+        print(f"❌ Streaming tokenizer test failed: {e}")
+        return False
+
+
+def test_parallel_build_matches_serial():
+    try:
+        from ngrams import Ngrams
+        from .compact import build_compact_model
+        from .parallel import build_compact_model_parallel
+
+        tokens = Ngrams._tokenize(_sample_text(2000), special_tokens=True)
+        for n in (2, 3, 5):
+            serial = _model_arrays(build_compact_model(tokens, n))
+            for workers in (2, 3):
+                parallel = _model_arrays(build_compact_model_parallel(tokens, n, workers=workers, min_tokens=0))
+                if parallel != serial:
+                    differing = sorted(name for name in serial if parallel.get(name) != serial[name])
+                    print(f"❌ Parallel build differs from serial (n={n}, workers={workers}): {', '.join(differing)}")
+                    return False
+        print("✅ Parallel build is identical to the serial build")
+        return True
+    except Exception as e:
+        print(f"❌ Parallel build test failed: {e}")
+        return False
+
+
+def test_added_text_survives_eviction():
+    try:
+        from ngrams import Ngrams
+        from .registry import ModelRegistry
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "corpus.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(_sample_text())
+            registry = ModelRegistry(max_size=2)
+            generator = Ngrams(corpus_file=path, n=3, model_registry=registry)
+            generator.add_text("Quixotic zephyrs waltz.")
+            for n in range(4, 12):
+                Ngrams(corpus_file=path, n=n, model_registry=registry)._get_model_entry(shuffled=False)
+            if registry.stats()["evictions"] < 8:
+                print("❌ Building other models did not evict anything")
+                return False
+            for shuffled in (False, True):
+                model = generator._get_model_entry(shuffled=shuffled).model
+                if model.unigram_counts.get("zephyrs") != 1:
+                    print(f"❌ Added text was lost after eviction (shuffled={shuffled})")
+                    return False
+        print("✅ Added text survives registry eviction")
+        return True
+    except Exception as e:
+        print(f"❌ Eviction test failed: {e}")
+        return False
+
+
+def test_shared_batch_matches_private_batch():
+    try:
+        from ngrams import Ngrams
+        from .registry import ModelRegistry
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "corpus.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(_sample_text(2000))
+            generator = Ngrams(corpus_file=path, n=3, model_registry=ModelRegistry())
+            private = generator.generate_phrases_batch(200, workers=2, seed=11, task_size=20)
+            shared = generator.generate_phrases_batch(200, workers=2, seed=11, task_size=20, share_model=True)
+        if shared != private:
+            print("❌ Seeded batch differs with share_model=True")
+            return False
+        print("✅ Seeded batches are identical with and without share_model")
+        return True
+    except Exception as e:
+        print(f"❌ Shared batch test failed: {e}")
+        return False
+
+
+def test_pruning_fills_memory_budget():
+    try:
+        from ngrams import Ngrams
+        from .compact import build_compact_model
+        from .pruning import PruningPolicy, prune_model
+
+        model = build_compact_model(Ngrams._tokenize(_sample_text(2000), special_tokens=True), 5)
+        for fraction in (0.9, 0.6, 0.3):
+            budget = int(model.nbytes * fraction)
+            size = prune_model(model, PruningPolicy(memory_budget=budget)).nbytes
+            if not 0.95 * budget <= size <= budget:
+                print(f"❌ Pruned to {size} bytes for a {budget}-byte budget")
+                return False
+        print("✅ Pruning lands just under the memory budget")
+        return True
+    except Exception as e:
+        print(f"❌ Pruning budget test failed: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    print("🧪 Testing N-gram Engine Invariants")
+    print("=" * 40)
+
+    test1 = test_streaming_matches_tokenize()
+    test2 = test_parallel_build_matches_serial()
+    test3 = test_added_text_survives_eviction()
+    test4 = test_shared_batch_matches_private_batch()
+    test5 = test_pruning_fills_memory_budget()
+
+    if all((test1, test2, test3, test4, test5)):
+        print("\n🎉 All tests passed!")
+    else:
+        print("\n⚠️  Some tests failed.")
@@ -0,0 +1,231 @@
+from array import array
+from bisect import bisect_left
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from .compact import _ID_BITS, _ID_MASK, END, START, CompactModel, _count_edges
+
+# Values accepted for ``Ngrams(backend=...)``.
+MODEL_BACKENDS = ("compact", "suffix", "trie")
+
+
+class TrieLevel:
+    """All k-grams of one length, grouped under their (k-1)-gram parent.
+
+    Node ``i`` is the k-gram ending in ``labels[i]`` seen ``counts[i]``
+    times; its children (the (k+1)-grams extending it) are the nodes
+    ``children[i]:children[i + 1]`` of the next level, sorted by label.
+    The deepest level has no ``children``.
+    """
+
+    __slots__ = ("labels", "counts", "children")
+
+    def __init__(self, labels: array, counts: array, children: Optional[array]):
+        self.labels = labels
+        self.counts = counts
+        self.children = children
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(arr) * arr.itemsize for arr in (self.labels, self.counts, self.children) if arr is not None)
+
+
+def _build_levels(grams: Dict[Tuple[int, ...], int], n: int) -> List[TrieLevel]:
+    """Trie levels 1..n from ``{k-gram: count}``.
+
+    Prefixes that never occur as a k-gram themselves (``<START>`` padding)
+    are added with count 0 so every node has its parent.
+    """
+    by_length: List[Dict[Tuple[int, ...], int]] = [{} for _ in range(n + 1)]
+    for gram, count in grams.items():
+        by_length[len(gram)][gram] = count
+    for length in range(n, 1, -1):
+        shorter = by_length[length - 1]
+        for gram in by_length[length]:
+            prefix = gram[:-1]
+            if prefix not in shorter:
+                shorter[prefix] = 0
+
+    levels: List[TrieLevel] = []
+    ordered_above: List[Tuple[int, ...]] = []
+    for length in range(1, n + 1):
+        ordered = sorted(by_length[length])
+        counts = by_length[length]
+        if levels:
+            position = {gram: i for i, gram in enumerate(ordered_above)}
+            children = array("i", [0]) * (len(ordered_above) + 1)
+            for gram in ordered:
+                children[position[gram[:-1]] + 1] += 1
+            for i in range(1, len(children)):
+                children[i] += children[i - 1]
+            levels[-1].children = children
+        levels.append(TrieLevel(
+            array("i", (gram[-1] for gram in ordered)),
+            array("i", (counts[gram] for gram in ordered)),
+            None,
+        ))
+        ordered_above = ordered
+    return levels
+
+
+class TrieModel:
+    """N-gram counts of orders 2..n in one prefix trie.
+
+    Level k holds every k-gram once. A node is at the same time a successor
+    of its parent context (with its count) and the context of the order
+    above (its children), so no n-gram is stored twice the way CSR edges
+    of one order repeat as contexts of the next. The successors of a
+    context for every order come from one descent per order through
+    sorted child ranges, behind the same ``context_rows``/``context_counts``
+    lookups as :class:`CompactModel`.
+    """
+
+    vocab_size = CompactModel.vocab_size
+    unigram_counts = CompactModel.unigram_counts
+    vocab_mask = CompactModel.vocab_mask
+    context_ids = CompactModel.context_ids
+    successors = CompactModel.successors
+    delta_contexts = CompactModel.delta_contexts
+    copy = CompactModel.copy
+
+    def __init__(self, vocab: List[str], unigram: array, levels: List[TrieLevel]):
+        self.vocab = vocab
+        self.index: Dict[str, int] = {tok: i for i, tok in enumerate(vocab)}
+        self.unigram = unigram
+        self.total_unigrams = sum(unigram)
+        self.levels = levels
+        self.n = len(levels)
+        self.radix = len(vocab)
+        # Nothing is ever pending: add_tokens rebuilds the levels right away.
+        self.delta: Dict[int, Dict[int, Dict[int, int]]] = {}
+        self.delta_edges = 0
+        self.version = 0
+        self.pruning_stats: Optional[dict] = None
+        self._masks: Dict[Hashable, bytearray] = {}
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.unigram) * self.unigram.itemsize + sum(level.nbytes for level in self.levels)
+
+    def _node(self, gram: Sequence[int]) -> int:
+        """Index of ``gram`` in level ``len(gram)``, or -1."""
+        lo, hi = 0, len(self.levels[0])
+        for depth, tok_id in enumerate(gram):
+            level = self.levels[depth]
+            i = bisect_left(level.labels, tok_id, lo, hi)
+            if i >= hi or level.labels[i] != tok_id:
+                return -1
+            if depth + 1 < len(gram):
+                lo, hi = level.children[i], level.children[i + 1]
+        return i
+
+    def _successor_range(self, depth: int, node: int) -> Tuple[int, int]:
+        """Children of a context node without the zero-count ``<START>`` padding child."""
+        children = self.levels[depth].children
+        lo, hi = children[node], children[node + 1]
+        if lo < hi and self.levels[depth + 1].labels[lo] == 0:
+            lo += 1
+        return lo, hi
+
+    def _contexts(self, ctx_ids: Sequence[int], max_order: Optional[int] = None) -> List[Tuple[int, int, int, int]]:
+        """``(order, node, lo, hi)`` per seen order; successors are level-``order`` nodes ``lo:hi``."""
+        top = min(self.n, max_order or self.n, len(ctx_ids) + 1)
+        result: List[Tuple[int, int, int, int]] = []
+        for order in range(2, top + 1):
+            context = ctx_ids[-(order - 1):]
+            if min(context) < 0:
+                break
+            node = self._node(context)
+            if node < 0:
+                break
+            lo, hi = self._successor_range(order - 2, node)
+            if lo >= hi:
+                break
+            result.append((order, node, lo, hi))
+        return result
+
+    def context_rows(self, ctx_ids: Sequence[int], max_order: Optional[int] = None) -> List[Tuple[int, int]]:
+        """(order, row) for every order whose context was seen; a row is the context's trie node."""
+        return [(order, node) for order, node, _lo, _hi in self._contexts(ctx_ids, max_order)]
+
+    def context_counts(self, ctx_ids: Sequence[int], max_order: Optional[int] = None) -> List[Tuple[int, int, Sequence[int], Sequence[int]]]:
+        """(order, total, successor ids, counts) per seen order"""
+        result = []
+        for order, _node, lo, hi in self._contexts(ctx_ids, max_order):
+            level = self.levels[order - 1]
+            counts = level.counts[lo:hi]
+            result.append((order, sum(counts), level.labels[lo:hi], counts))
+        return result
+
+    def grams(self) -> Dict[Tuple[int, ...], int]:
+        """``{k-gram: count}`` for k = 2..n, padding nodes left out."""
+        grams: Dict[Tuple[int, ...], int] = {}
+        prefixes: List[Tuple[int, ...]] = [(tok_id,) for tok_id in self.levels[0].labels]
+        for depth in range(1, self.n):
+            parent_level, level = self.levels[depth - 1], self.levels[depth]
+            current: List[Tuple[int, ...]] = [()] * len(level)
+            for parent, prefix in enumerate(prefixes):
+                for i in range(parent_level.children[parent], parent_level.children[parent + 1]):
+                    current[i] = prefix + (level.labels[i],)
+                    if level.counts[i]:
+                        grams[current[i]] = level.counts[i]
+            prefixes = current
+        return grams
+
+    def add_tokens(self, tokens: Iterable[str]) -> int:
+        """Count a ``<START>``/``<END>`` token stream in and rebuild the levels."""
+        before = self.total_unigrams
+        edge_counts = _count_edges(tokens, self.n, self.vocab, self.index, self.unigram)
+        added = sum(self.unigram) - before
+        if not added:
+            return 0
+        grams = self.grams()
+        for gram, count in _edge_grams(edge_counts).items():
+            grams[gram] = grams.get(gram, 0) + count
+        self.levels = _build_levels(grams, self.n)
+        self.total_unigrams += added
+        self.radix = len(self.vocab)
+        self.version += 1
+        return added
+
+    def compact(self) -> None:
+        pass
+
+    def order_sizes(self) -> Dict[int, Dict[str, int]]:
+        sizes: Dict[int, Dict[str, int]] = {}
+        for order in range(2, self.n + 1):
+            contexts = 0
+            for node in range(len(self.levels[order - 2])):
+                lo, hi = self._successor_range(order - 2, node)
+                contexts += lo < hi
+            edges = sum(1 for count in self.levels[order - 1].counts if count)
+            sizes[order] = {"contexts": contexts, "edges": edges}
+        return sizes
+
+
+def _edge_grams(edge_counts: Dict[int, Dict[int, int]]) -> Dict[Tuple[int, ...], int]:
+    """Unpack the packed ``(context, token)`` edges of every order into k-gram tuples."""
+    grams: Dict[Tuple[int, ...], int] = {}
+    for order, edges in edge_counts.items():
+        shifts = [_ID_BITS * j for j in range(order - 1, -1, -1)]
+        for edge, count in edges.items():
+            grams[tuple((edge >> shift) & _ID_MASK for shift in shifts)] = count
+    return grams
+
+
+def build_trie_model(tokens: Iterable[str], n: int) -> TrieModel:
+    """Count orders 2..n over a ``<START>``/``<END>`` token stream into a trie."""
+    n = max(2, int(n))
+    vocab: List[str] = [START]
+    index: Dict[str, int] = {START: 0}
+    unigram = array("i", [0])
+    edge_counts = _count_edges(tokens, n, vocab, index, unigram)
+
+    if END not in index:
+        index[END] = len(vocab)
+        vocab.append(END)
+        unigram.append(1)
+
+    return TrieModel(vocab, unigram, _build_levels(_edge_grams(edge_counts), n))
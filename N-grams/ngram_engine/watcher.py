@@ -0,0 +1,76 @@
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Sequence
+
+
+class CorpusWatcher:
+    """Polls ``.txt`` corpus files and reports text appended to them.
+
+    Only whole lines are reported: a file whose new data does not end in a
+    newline yet is left for the next poll, so a writer caught mid-line is
+    never split into two sentences. A file that shrinks is treated as
+    rewritten and simply re-baselined.
+    """
+
+    def __init__(
+        self,
+        paths: Sequence[str],
+        on_append: Callable[[str, str], None],
+        interval: float = 2.0,
+        encoding: str = "utf-8",
+    ):
+        self.paths: List[str] = [str(p) for p in paths if str(p).lower().endswith(".txt")]
+        self.on_append = on_append
+        self.interval = interval
+        self.encoding = encoding
+        self._offsets: Dict[str, int] = {path: self._size(path) for path in self.paths}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _size(path: str) -> int:
+        try:
+            return os.stat(path).st_size
+        except OSError:
+            return 0
+
+    def poll(self) -> int:
+        """Check every file once; returns how many reported an append."""
+        changed = 0
+        for path in self.paths:
+            size = self._size(path)
+            offset = self._offsets.get(path, 0)
+            if size < offset:
+                self._offsets[path] = size
+                continue
+            if size == offset:
+                continue
+            with open(path, "rb") as f:
+                f.seek(offset)
+                data = f.read(size - offset)
+            if not data.endswith(b"\n"):
+                continue
+            self._offsets[path] = offset + len(data)
+            self.on_append(path, data.decode(self.encoding, errors="replace"))
+            changed += 1
+        return changed
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"Corpus watcher error: {e}")
+
+    def start(self) -> "CorpusWatcher":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="corpus-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -1,29 +1,107 @@
+import os
 import random
 import math
 import re
 import pickle
 from collections import Counter
-from typing import List, Tuple, Union, Optional, Dict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, Tuple, Union, Optional, Dict, Iterable, Iterator, Sequence
+
+from ngram_engine import (
+    DEFAULT_CHUNK_SIZE,
+    CompactModel,
+    CompiledModel,
+    CorpusStats,
+    CorpusWatcher,
+    InterpolatedSampler,
+    ModelEntry,
+    MAX_LOAD_THREADS,
+    MODEL_BACKENDS,
+    ModelRegistry,
+    MultiChainSampler,
+    NO_STAGE,
+    PhraseScore,
+    PhraseScorer,
+    PROCESS_TOKENIZE_MIN_CHARS,
+    PruningPolicy,
+    SuffixArrayModel,
+    TrieModel,
+    WordLexicon,
+    GenerationProfiler,
+    attach_model,
+    build_compact_model,
+    build_compact_model_parallel,
+    build_suffix_model,
+    build_trie_model,
+    categorize_by_rank,
+    compile_model,
+    corpus_fingerprint,
+    ends_sentence,
+    expand_corpus_paths,
+    get_model_registry,
+    get_word_lexicon,
+    is_indexed_corpus,
+    is_sharded,
+    iter_sentence_tokens,
+    iter_string_chunks,
+    iter_text_chunks,
+    length_rule,
+    length_score,
+    load_model,
+    merge_shard_tokens,
+    pattern_score,
+    prune_model,
+    publish_model,
+    score_vocabulary,
+    section_text,
+    syllable_score,
+)
+
+# Seed of the sentence shuffle behind the shuffled model variant.
+SHUFFLE_SEED = 1
 
 
 class Ngrams:
-    def __init__(self, corpus_file: Union[str, list, None] = None, n: int = 3, num_phrases: int = 5, difficulty: str = "medium"):
+    def __init__(self, corpus_file: Union[str, list, None] = None, n: int = 3, num_phrases: int = 5, difficulty: str = "medium", model_file: Optional[str] = None, model_registry: Optional[ModelRegistry] = None, chunk_size: Optional[int] = None, profiler: Optional[GenerationProfiler] = None, pruning: Optional[PruningPolicy] = None, build_workers: Optional[int] = None, backend: str = "compact", shared_model: Optional[str] = None, lexicon: Optional[WordLexicon] = None):
         if corpus_file is None:
             corpus_file = ["corpora/corpora.pkl"]
         self.corpus_file = corpus_file
         self.n = n
         self.num_phrases = num_phrases
         self.difficulty = difficulty.lower()
+        self.model_file = model_file
+        self.shared_model = shared_model
+        self.model_registry = model_registry if model_registry is not None else get_model_registry()
+        # Loaded on the first difficulty analysis, not per generator.
+        self.lexicon = lexicon
+        self.chunk_size = chunk_size
+        self._profiler = profiler
+        self.pruning = pruning
+        self.build_workers = build_workers
+        self.backend = backend.lower()
+        if self.backend not in MODEL_BACKENDS:
+            raise ValueError(f"Unknown model backend '{backend}'; choose one of {', '.join(MODEL_BACKENDS)}.")
+        if self.backend != "compact" and pruning is not None:
+            raise ValueError("Pruning only applies to the compact backend.")
+        if chunk_size and self._parallel_build:
+            raise ValueError("Parallel builds shard the whole token list; pass build_workers or chunk_size, not both.")
         
         self._text_cache: Optional[str] = None
-        self._tokens_cache: Optional[List[str]] = None
-        self._word_difficulty_cache: Dict[str, str] = {}
-        self._tokens_analyzed: List[str] = []
         self._difficulty_words_cache: Optional[List[str]] = None
+        self._sampler: Optional[InterpolatedSampler] = None
+        self._phrase_scorer: Optional[PhraseScorer] = None
+        self._compiled_model: Optional[CompiledModel] = None
+        self._model_entry: Optional[ModelEntry] = None
+        self._watched_fingerprint: Optional[tuple] = None
+        # Source of every sampling draw; batch tasks swap in a seeded Random.
+        self._rng = random
         
         self._difficulty_lengths = {"easy": 6, "medium": 8, "hard": 10}
 
     def _extract_section_text(self, data: Union[str, List, tuple, dict], section: Optional[str]) -> str:
+        if is_indexed_corpus(data):
+            return section_text(data, section)
         if section and isinstance(data, dict):
             lower_map = {str(k).lower(): k for k in data.keys()}
             canonical = section.lower()
@@ -98,7 +176,8 @@ class Ngrams:
         except Exception as e:
             raise RuntimeError(f"Error loading corpus file: {e}")
 
-    def _tokenize(self, text: str, special_tokens: bool = True) -> List[str]:
+    @staticmethod
+    def _tokenize(text: str, special_tokens: bool = True) -> List[str]:
         if not text or not text.strip():
             return []
         
@@ -120,238 +199,642 @@ class Ngrams:
         
         return tokens
 
-    def _get_tokens(self, corpus_file: Union[str, List[str]], difficulty_section: Optional[str] = None) -> List[str]:
-        if self._tokens_cache is not None:
-            return self._tokens_cache
+    def _read_tokens(self, corpus_file: Union[str, List[str]], difficulty_section: Optional[str] = None) -> List[str]:
+        if is_sharded(corpus_file):
+            return self._read_shard_tokens(expand_corpus_paths(corpus_file), difficulty_section)
         
-        if isinstance(corpus_file, (list, tuple)):
-            combined_text_parts: List[str] = []
-            for path in corpus_file:
-                try:
-                    part = self._load_text(str(path), difficulty_section=difficulty_section)
-                    if part:
-                        combined_text_parts.append(str(part))
-                except FileNotFoundError:
-                    continue
-            text = "\n".join(combined_text_parts)
-        else:
+        with self._stage("load"):
             text = self._load_text(corpus_file, difficulty_section=difficulty_section)
         
-        tokens = self._tokenize(text, special_tokens=True)
+        with self._stage("tokenize"):
+            return self._tokenize(text, special_tokens=True)
+
+    def _read_shard_tokens(self, paths: List[str], difficulty_section: Optional[str] = None) -> List[str]:
+        """Load shards on a thread pool and tokenize them on a process pool.
+
+        The result equals tokenizing the shard texts joined with newlines,
+        but no combined text is ever built. Missing shards are skipped.
+        """
+        def load(path: str) -> str:
+            try:
+                return str(self._load_text(path, difficulty_section=difficulty_section) or "")
+            except FileNotFoundError:
+                return ""
         
-        if random.random() < 0.2:
-            shuffled_tokens = []
-            current_sentence = []
-            for token in tokens:
-                if token == "<START>":
-                    if current_sentence:
-                        random.shuffle(current_sentence)
-                        shuffled_tokens.extend(current_sentence)
-                        current_sentence = []
-                    shuffled_tokens.append(token)
-                elif token == "<END>":
-                    current_sentence.append(token)
-                    random.shuffle(current_sentence)
-                    shuffled_tokens.extend(current_sentence)
-                    current_sentence = []
-                else:
-                    current_sentence.append(token)
-            
-            if current_sentence:
-                random.shuffle(current_sentence)
-                shuffled_tokens.extend(current_sentence)
-            
-            tokens = shuffled_tokens
+        with self._stage("load"):
+            if len(paths) > 1:
+                with ThreadPoolExecutor(max_workers=min(MAX_LOAD_THREADS, len(paths))) as pool:
+                    texts = [text for text in pool.map(load, paths) if text]
+            else:
+                texts = [text for text in map(load, paths) if text]
         
-        self._tokens_cache = tokens
-        return tokens
+        with self._stage("tokenize"):
+            total_chars = sum(len(text) for text in texts)
+            workers = min(len(texts), os.cpu_count() or 1)
+            if workers > 1 and total_chars >= PROCESS_TOKENIZE_MIN_CHARS:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    token_lists = list(pool.map(Ngrams._tokenize, texts))
+            else:
+                token_lists = [self._tokenize(text, special_tokens=True) for text in texts]
+            return list(merge_shard_tokens(zip(token_lists, map(ends_sentence, texts))))
+
+    def _iter_file_chunks(self, corpus_file: str, difficulty_section: Optional[str], chunk_size: int) -> Iterator[str]:
+        if corpus_file.lower().endswith(".pkl"):
+            yield from iter_string_chunks(self._load_text(corpus_file, difficulty_section=difficulty_section), chunk_size)
+            return
+        try:
+            has_content = False
+            for chunk in iter_text_chunks(corpus_file, chunk_size):
+                has_content = has_content or bool(chunk.strip())
+                yield chunk
+            if not has_content:
+                raise ValueError("Corpus file is empty.")
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Corpus file '{corpus_file}' not found!")
+        except Exception as e:
+            raise RuntimeError(f"Error loading corpus file: {e}")
 
-    def _analyze_word_difficulty(self, tokens: List[str]) -> Dict[str, str]:
-        if self._word_difficulty_cache and self._tokens_analyzed == tokens:
-            return self._word_difficulty_cache
+    def _iter_corpus_chunks(self, corpus_file: Union[str, List[str]], difficulty_section: Optional[str], chunk_size: int) -> Iterator[str]:
+        if not is_sharded(corpus_file):
+            yield from self._iter_file_chunks(str(corpus_file), difficulty_section, chunk_size)
+            return
+        first = True
+        for path in expand_corpus_paths(corpus_file):
+            try:
+                for i, chunk in enumerate(self._iter_file_chunks(str(path), difficulty_section, chunk_size)):
+                    if i == 0 and not first:
+                        yield "\n"
+                    first = False
+                    yield chunk
+            except FileNotFoundError:
+                continue
 
-        filtered_tokens = [token for token in tokens 
-                          if token not in ["<START>", "<END>"] and len(token) > 1]
-        
-        word_counts = Counter(filtered_tokens)
-        word_scores = self._calculate_word_complexity_scores(word_counts)
-        word_difficulty = self._categorize_words_by_difficulty(word_scores)
+    def _iter_tokens(self, corpus_file: Union[str, List[str]], difficulty_section: Optional[str] = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+        return iter_sentence_tokens(self._iter_corpus_chunks(corpus_file, difficulty_section, chunk_size))
+
+    def _shuffle_sentences(self, tokens: Iterable[str], rng=random) -> Iterator[str]:
+        current_sentence = []
+        for token in tokens:
+            if token == "<START>":
+                if current_sentence:
+                    rng.shuffle(current_sentence)
+                    yield from current_sentence
+                    current_sentence = []
+                yield token
+            elif token == "<END>":
+                current_sentence.append(token)
+                rng.shuffle(current_sentence)
+                yield from current_sentence
+                current_sentence = []
+            else:
+                current_sentence.append(token)
         
-        self._word_difficulty_cache = word_difficulty
-        self._tokens_analyzed = tokens[:]
-        return word_difficulty
+        if current_sentence:
+            rng.shuffle(current_sentence)
+            yield from current_sentence
+
+    def _analyze_word_counts(self, word_counts: Counter) -> Dict[str, str]:
+        with self._stage("difficulty_analysis"):
+            word_counts = Counter({word: count for word, count in word_counts.items() if len(word) > 1})
+            word_scores = self._calculate_word_complexity_scores(word_counts)
+            return self._categorize_words_by_difficulty(word_scores)
     
     def _calculate_word_complexity_scores(self, word_counts: Counter) -> dict:
-        word_scores = {}
-        
-        for word, count in word_counts.items():
-            if len(word) < 2:
-                continue
-                
-            length_score = self._calculate_length_score(word)
-            freq_score = self._calculate_frequency_score(word, count, word_counts)
-            complexity_score = self._calculate_pattern_complexity_score(word)
-            syllable_score = self._calculate_syllable_score(word)
-            
-            total_score = length_score + freq_score + complexity_score + syllable_score
-            word_scores[word] = total_score
-        
-        return word_scores
+        if self.lexicon is None:
+            self.lexicon = get_word_lexicon()
+        scores = score_vocabulary(word_counts, self.lexicon.features)
+        if self.lexicon.pending:
+            try:
+                self.lexicon.save()
+            except OSError:
+                # The lexicon only saves work; scores are complete without it.
+                pass
+        return scores
     
     def _calculate_length_score(self, word: str) -> float:
-        return len(word) * 0.3
+        return length_score(word)
     
     def _calculate_frequency_score(self, word: str, count: int, word_counts: Counter) -> float:
         total_words = sum(word_counts.values())
         return (1 - (count / total_words)) * 5
     
     def _calculate_pattern_complexity_score(self, word: str) -> float:
-        complexity_score = 0.0
-        consonants = 0
-        
-        for char in word.lower():
-            if char in 'aeiou':
-                consonants = 0
-            elif char.isalpha():
-                consonants += 1
-                if consonants >= 3:
-                    complexity_score += 1.0
-            else:
-                complexity_score += 0.5
-        
-        return complexity_score
+        return pattern_score(word)
     
     def _calculate_syllable_score(self, word: str) -> float:
-        consonants = sum(1 for char in word.lower() if char.isalpha() and char not in 'aeiou')
-        vowels = sum(1 for char in word.lower() if char in 'aeiou')
-        
-        syllable_count = max(1, (consonants + vowels) // 3)
-        return syllable_count * 0.5
+        return syllable_score(word)
     
     def _categorize_words_by_difficulty(self, word_scores: dict) -> dict:
-        sorted_words = sorted(word_scores.items(), key=lambda x: x[1])
-        total_words = len(sorted_words)
-        
-        easy_threshold = int(total_words * 0.4)
-        medium_threshold = int(total_words * 0.8)
-        
-        word_difficulty = {}
-        for i, (word, score) in enumerate(sorted_words):
-            if i < easy_threshold:
-                word_difficulty[word] = "easy"
-            elif i < medium_threshold:
-                word_difficulty[word] = "medium"
-            else:
-                word_difficulty[word] = "hard"
-        
-        return word_difficulty
+        return categorize_by_rank(word_scores)
 
     def generate_phrases(self) -> List[str]:
-        self.clear_cache()
-        
-        random.seed()
-        
-        tokens = self._get_tokens(self.corpus_file, difficulty_section=self.difficulty)
-        return self._generate_phrases(tokens, self.num_phrases)
+        with self._stage("generate"):
+            self.clear_cache()
+            
+            random.seed()
+            
+            entry = self._get_model_entry()
+            if entry.model is None:
+                self._count("fallbacks", self.num_phrases)
+                return self._generate_fallback_phrases(entry.tokens, self.num_phrases)
+            return self._generate_phrases_from_model(entry.model, self.num_phrases, entry.tokens)
+
+    def enable_profiling(self, callback=None) -> GenerationProfiler:
+        """Start recording stage timings and sampling counters.
+
+        ``callback(kind, name, value)`` receives every record as it happens;
+        the aggregates are available from :meth:`get_profiling_stats`.
+        """
+        self._profiler = GenerationProfiler(callback)
+        return self._profiler
+
+    def disable_profiling(self) -> None:
+        self._profiler = None
+
+    def get_profiling_stats(self) -> dict:
+        if self._profiler is None:
+            return {}
+        return self._profiler.stats()
+
+    def _stage(self, name: str):
+        if self._profiler is None:
+            return NO_STAGE
+        return self._profiler.stage(name)
+
+    def _count(self, name: str, increment: int = 1) -> None:
+        if self._profiler is not None:
+            self._profiler.count(name, increment)
+
+    @property
+    def _parallel_build(self) -> bool:
+        """Whether compact models are counted on a process pool, from an in-memory token list."""
+        return self.backend == "compact" and self.build_workers is not None and self.build_workers > 1
 
-    def _generate_phrases(self, tokens: List[str], num_phrases: int) -> List[str]:
+    @property
+    def _precompiled(self) -> bool:
+        """Whether the model comes ready-made from an artifact or a shared segment."""
+        return bool(self.model_file or self.shared_model)
+
+    def _model_key(self, shuffled: bool = False, fingerprint: Optional[tuple] = None) -> tuple:
+        n = max(2, int(self.n))
+        if self.shared_model:
+            return ("shared", self.shared_model, self.difficulty, n)
+        if self.model_file:
+            return ("compiled", corpus_fingerprint(self.model_file), self.difficulty, n)
+        if fingerprint is None:
+            fingerprint = corpus_fingerprint(self.corpus_file)
+        pruning = self.pruning.key() if self.pruning else None
+        return ("corpus", fingerprint, self.difficulty, n, shuffled, bool(self.chunk_size), pruning, self.backend)
+
+    def _model_variants(self) -> List[bool]:
+        return [False] if self._precompiled else [False, True]
+
+    def _entry_builder(self, shuffled: bool):
+        if self._precompiled:
+            return lambda: self._with_stats(self._load_compiled_entry())
+        return lambda: self._with_stats(self._build_model_entry(shuffled))
+
+    def _get_model_entry(self, shuffled: Optional[bool] = None) -> ModelEntry:
+        if shuffled is None:
+            shuffled = False if self._precompiled else self._rng.random() < 0.2
+        with self._stage("model_lookup"):
+            entry = self.model_registry.get_or_build(self._model_key(shuffled), self._entry_builder(shuffled))
+        self._model_entry = entry
+        return entry
+
+    def _build_model_entry(self, shuffled: bool) -> ModelEntry:
+        # A fixed shuffle seed makes the shuffled variant the same in every
+        # process, so seeded batches do not depend on which worker built it.
+        shuffle_rng = random.Random(SHUFFLE_SEED)
+        if self.chunk_size:
+            token_stream = self._iter_tokens(self.corpus_file, self.difficulty, self.chunk_size)
+            if shuffled:
+                token_stream = self._shuffle_sentences(token_stream, shuffle_rng)
+            corpus_stats = CorpusStats()
+            model = self._build_ngram_model(corpus_stats.counting(token_stream))
+            return ModelEntry([tok for tok in model.unigram_counts if tok != "<END>"], model, corpus_stats=corpus_stats)
+        
+        tokens = self._read_tokens(self.corpus_file, difficulty_section=self.difficulty)
+        if shuffled:
+            tokens = list(self._shuffle_sentences(tokens, shuffle_rng))
+        corpus_stats = CorpusStats.from_tokens(tokens)
         if len(tokens) < max(2, self.n):
-            return self._generate_fallback_phrases(tokens, num_phrases)
+            return ModelEntry(tokens, None, corpus_stats=corpus_stats)
+        return ModelEntry(tokens, self._build_ngram_model(tokens), corpus_stats=corpus_stats)
+
+    def _load_compiled_entry(self) -> ModelEntry:
+        compiled = self._get_compiled_model()
+        vocabulary = [tok for tok in compiled.unigram_counts if tok != "<END>"]
+        return ModelEntry(vocabulary, compiled)
 
-        self._analyze_word_difficulty(tokens)
+    def _worker_config(self) -> dict:
+        """Constructor arguments that rebuild this generator's model in a worker process."""
+        return {
+            "corpus_file": self.corpus_file,
+            "n": self.n,
+            "difficulty": self.difficulty,
+            "model_file": self.model_file,
+            "shared_model": self.shared_model,
+            "chunk_size": self.chunk_size,
+            "pruning": self.pruning,
+            "backend": self.backend,
+        }
 
-        models_by_order, unigram_counts = self._build_ngram_model(tokens)
+    def generate_phrases_batch(
+        self,
+        total: int,
+        workers: Optional[int] = None,
+        seed: Optional[int] = None,
+        task_size: int = 250,
+        max_rounds: int = 5,
+        share_model: bool = False,
+    ) -> List[str]:
+        """Generate up to ``total`` unique phrases on a process pool.
 
-        def in_length_range(length: int) -> bool:
-            if self.difficulty == "easy":
-                return length <= 4
-            if self.difficulty == "medium":
-                return 5 <= length <= 7
-            return length >= 8
+        The work is split into tasks of ``task_size`` phrases; every task
+        seeds its own RNG stream from ``seed`` and its index, so a seeded
+        batch does not depend on which worker ran which task. Duplicates
+        across tasks are dropped and topped up for at most ``max_rounds``.
+        With ``share_model`` this process builds both model variants once
+        and the workers attach to them through shared memory instead of
+        each building their own copies; a seeded batch is the same either
+        way.
+        """
+        workers = max(1, workers or os.cpu_count() or 1)
+        base_seed = seed if seed is not None else random.SystemRandom().getrandbits(64)
+        config = self._worker_config()
 
         phrases: List[str] = []
-        used_phrases = set()
+        seen = set()
+        task_index = 0
+        # Worker config per model variant, indexed by ``shuffled``.
+        configs = {False: config, True: config}
+        pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        segments: List[SharedMemory] = []
+        try:
+            if pool and share_model and not self._precompiled and self.backend == "compact":
+                if self._get_model_entry(shuffled=False).model is not None:
+                    for shuffled in self._model_variants():
+                        model = self._get_model_entry(shuffled=shuffled).model
+                        segments.append(publish_model(model, None, self._artifact_metadata(model)))
+                        configs[shuffled] = dict(config, shared_model=segments[-1].name)
+            for _ in range(max_rounds):
+                missing = total - len(phrases)
+                if missing <= 0:
+                    break
+                tasks = []
+                while missing > 0:
+                    count = min(task_size, missing)
+                    tasks.append((configs, count, f"{base_seed}:{task_index}"))
+                    task_index += 1
+                    missing -= count
+                results = pool.map(_generate_batch_task, tasks) if pool else map(_generate_batch_task, tasks)
+                before = len(phrases)
+                for batch in results:
+                    for phrase in batch:
+                        if phrase and phrase not in seen:
+                            seen.add(phrase)
+                            phrases.append(phrase)
+                if len(phrases) == before:
+                    break
+        finally:
+            if pool:
+                pool.shutdown()
+            for segment in segments:
+                segment.close()
+                segment.unlink()
+        return phrases[:total]
+
+    def generate_phrases_bulk(
+        self,
+        total: int,
+        chains: int = 1024,
+        seed: Optional[int] = None,
+        max_rounds: int = 3,
+    ) -> List[str]:
+        """Generate up to ``total`` unique phrases in one process, ``chains`` at a time.
+
+        A high-throughput alternative to :meth:`generate_phrases` for bulk
+        output: all chains of a round advance together through
+        :class:`MultiChainSampler` over the same interpolated sampler.
+        Duplicates are dropped and topped up; it gives up after
+        ``max_rounds`` rounds in a row add nothing new. There are no
+        fallback phrases or variations.
+        """
+        rng = random.Random(seed)
+        with self._stage("generate"):
+            # The model variant comes from ``rng`` too, so a seeded call is reproducible.
+            entry = self._get_model_entry(shuffled=rng.random() < 0.2 and not self._precompiled)
+            if entry.model is None:
+                self._count("fallbacks", total)
+                return self._generate_fallback_phrases(entry.tokens, total)
+            sampler = self._get_sampler(entry.model, length_rule(self.difficulty))
+            bulk = MultiChainSampler(sampler, max(2, int(self.n)))
+            base_length = self._difficulty_lengths.get(self.difficulty, 8)
+
+            phrases: List[str] = []
+            seen = set()
+            stale = 0
+            while len(phrases) < total and stale < max_rounds:
+                missing = total - len(phrases)
+                targets = [base_length + rng.randint(0, 3) for _ in range(min(chains, missing))]
+                self._count("slots", len(targets))
+                with self._stage("sampling"):
+                    results = bulk.generate(targets, rng)
+                before = len(phrases)
+                for words in results:
+                    phrase = " ".join(words)
+                    if phrase and phrase not in seen:
+                        seen.add(phrase)
+                        phrases.append(phrase)
+                stale = stale + 1 if len(phrases) == before else 0
+            self._count("steps", bulk.steps)
+        return phrases[:total]
+
+    def score_phrases(
+        self,
+        phrases: Sequence[str],
+        workers: Optional[int] = None,
+        task_size: int = 2000,
+    ) -> List[PhraseScore]:
+        """Log-probability and per-word perplexity of every phrase, in input order.
+
+        Phrases are tokenized like corpus text (only words are scored) and
+        scored under the interpolation weights used for generation. With
+        ``workers`` above 1 the batch is split into tasks of ``task_size``
+        phrases on a process pool; each worker builds or reuses its own
+        model.
+        """
+        workers = max(1, workers or 1)
+        if workers > 1 and len(phrases) > task_size:
+            config = self._worker_config()
+            tasks = [(config, list(phrases[i:i + task_size])) for i in range(0, len(phrases), task_size)]
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+                return [score for batch in pool.map(_score_batch_task, tasks) for score in batch]
+
+        with self._stage("scoring"):
+            # Sentence shuffling leaves the counts unchanged; score the plain variant.
+            entry = self._get_model_entry(shuffled=False)
+            if entry.model is None:
+                raise ValueError("The corpus is too small to build a model to score phrases against.")
+            scorer = self._phrase_scorer
+            if scorer is None or scorer.model is not entry.model or scorer.version != entry.model.version:
+                scorer = self._phrase_scorer = PhraseScorer(entry.model, self._get_interpolation_weights(max(2, int(self.n))))
+            words = [[tok for tok in self._tokenize(str(phrase), special_tokens=False) if tok.isalpha()] for phrase in phrases]
+            scores = scorer.score(words, [str(phrase) for phrase in phrases])
+        self._count("scored", len(scores))
+        return scores
+
+    def add_text(self, text: str) -> int:
+        """Count new corpus text into the cached models without a rebuild.
+
+        The updated models are pinned in the registry, since a rebuild from
+        ``corpus_file`` would not hold the added text.
+        """
+        return self._apply_tokens(self._tokenize(text, special_tokens=True))
+
+    def add_sentences(self, sentences: Iterable[str]) -> int:
+        tokens: List[str] = []
+        for sentence in sentences:
+            tokens.extend(self._tokenize(str(sentence), special_tokens=True))
+        return self._apply_tokens(tokens)
+
+    def _apply_tokens(self, tokens: List[str], previous_fingerprint: Optional[tuple] = None) -> int:
+        added = 0
+        registry = self.model_registry
+        with registry.update_lock:
+            for shuffled in self._model_variants():
+                # Text added by hand is only in the cached entry, so it is
+                # pinned there; lines appended to a watched file come back
+                # on a rebuild unless the old entry already held added text.
+                if previous_fingerprint is None:
+                    pin = True
+                    entry = registry.get_or_build(self._model_key(shuffled), self._entry_builder(shuffled))
+                else:
+                    previous_key = self._model_key(shuffled, previous_fingerprint)
+                    pin = registry.is_pinned(previous_key)
+                    entry = registry.pop(previous_key)
+                    if entry is None:
+                        continue
+                variant_tokens = list(self._shuffle_sentences(tokens)) if shuffled else tokens
+                entry, added = self._updated_entry(entry, variant_tokens)
+                registry.put(self._model_key(shuffled), entry, pin=pin)
         
+        self._model_entry = None
+        return added
+
+    def _updated_entry(self, entry: ModelEntry, tokens: List[str]) -> Tuple[ModelEntry, int]:
+        """A new entry with ``tokens`` counted in, and the number of counted positions.
+
+        ``entry`` and its model are left untouched, so threads still
+        sampling from them never see a half-applied update; the caller
+        swaps the new entry into the registry in one step. The new entry's
+        statistics drop the difficulty buckets and order sizes, which are
+        recomputed on the next stats call.
+        """
+        corpus_stats = entry.corpus_stats.copy() if entry.corpus_stats is not None else None
+        if corpus_stats is not None:
+            corpus_stats.add(tokens)
+        if entry.model is None:
+            updated_tokens = entry.tokens + tokens
+            model = self._build_ngram_model(updated_tokens) if len(updated_tokens) >= max(2, self.n) else None
+            return ModelEntry(updated_tokens, model, corpus_stats=corpus_stats, version=entry.version + 1), len(tokens)
+        model = entry.model.copy()
+        known = len(model.vocab)
+        added = model.add_tokens(tokens)
+        if self._precompiled or self.chunk_size:
+            updated_tokens = entry.tokens + [tok for tok in model.vocab[known:] if tok != "<END>"]
+        else:
+            updated_tokens = entry.tokens + tokens
+        return ModelEntry(updated_tokens, model, corpus_stats=corpus_stats, version=entry.version + 1), added
+
+    def watch_corpus(self, interval: float = 2.0, start: bool = True) -> CorpusWatcher:
+        """Apply lines appended to the ``.txt`` corpus files to the cached models.
+
+        With ``start=True`` the files are polled on a daemon thread; pass
+        ``start=False`` and call ``poll()`` to apply changes from your own loop.
+        """
+        paths = expand_corpus_paths(self.corpus_file)
+        self._watched_fingerprint = corpus_fingerprint(self.corpus_file)
+        watcher = CorpusWatcher(paths, self._apply_corpus_append, interval=interval)
+        return watcher.start() if start else watcher
+
+    def _apply_corpus_append(self, path: str, text: str) -> None:
+        tokens = self._tokenize(text, special_tokens=True)
+        if self._precompiled:
+            self._apply_tokens(tokens)
+            return
+        previous = self._watched_fingerprint
+        self._watched_fingerprint = corpus_fingerprint(self.corpus_file)
+        self._apply_tokens(tokens, previous_fingerprint=previous)
+
+    def get_model_cache_stats(self) -> Dict[str, int]:
+        return self.model_registry.stats()
+
+    def _generate_phrases_from_model(
+        self,
+        model: CompactModel,
+        num_phrases: int,
+        fallback_tokens: List[str],
+    ) -> List[str]:
+        phrases: List[str] = []
+        slots = self._iter_phrase_slots(model, fallback_tokens, set())
         for _ in range(num_phrases):
+            phrase = next(slots)
+            if phrase is not None:
+                phrases.append(phrase)
+        return phrases
+
+    def _iter_phrase_slots(
+        self,
+        model: CompactModel,
+        fallback_tokens: List[str],
+        used_phrases: set,
+    ) -> Iterator[Optional[str]]:
+        in_length_range = length_rule(self.difficulty)
+
+        while True:
             target_len = self._get_target_phrase_length()
             max_attempts = 10
+            produced: Optional[str] = None
+            self._count("slots")
             
             for attempt in range(max_attempts):
-                phrase_words = self._generate_phrase_with_model(models_by_order, unigram_counts, target_len, in_length_range)
+                self._count("attempts")
+                with self._stage("sampling"):
+                    phrase_words = self._generate_phrase_with_model(model, target_len, in_length_range)
                 if not phrase_words:
-                    fallback_phrase = self._generate_fallback_phrases(tokens, 1)[0]
+                    self._count("empty_phrases")
+                    self._count("fallbacks")
+                    fallback_phrase = self._generate_fallback_phrases(fallback_tokens, 1)[0]
                     if fallback_phrase not in used_phrases:
-                        phrases.append(fallback_phrase)
-                        used_phrases.add(fallback_phrase)
+                        produced = fallback_phrase
                     break
                 else:
                     phrase = " ".join(phrase_words)
                     if phrase not in used_phrases:
-                        phrases.append(phrase)
-                        used_phrases.add(phrase)
+                        produced = phrase
                         break
                     if attempt < max_attempts - 1:
+                        self._count("retries")
                         target_len = self._get_target_phrase_length()
                         continue
                     else:
+                        self._count("variations")
                         variation = self._create_phrase_variation(phrase_words)
                         if variation not in used_phrases:
-                            phrases.append(variation)
-                            used_phrases.add(variation)
+                            produced = variation
                         break
-        
-        return phrases
+            
+            if produced is not None:
+                used_phrases.add(produced)
+            else:
+                self._count("misses")
+            yield produced
 
-    def _build_ngram_model(self, tokens: List[str]) -> Tuple[Dict[int, Dict[Tuple[str, ...], Counter]], Counter]:
-        cleaned: List[str] = []
-        for t in tokens:
-            if t in ("<START>", "<END>"):
-                cleaned.append(t)
-            elif t.isalpha():
-                cleaned.append(t)
-        n = max(2, int(self.n))
-        models_by_order: Dict[int, Dict[Tuple[str, ...], Counter]] = {k: {} for k in range(2, n + 1)}
-        unigram_counts: Counter = Counter()
+    def iter_phrases(self, max_misses: int = 50) -> Iterator[str]:
+        """Yield unique phrases on demand from one model lookup.
 
-        context: List[str] = []
-        for tok in cleaned:
-            if tok == "<START>":
-                context = ["<START>"] * (n - 1)
+        The model and the dedup set stay alive for the life of the
+        iterator. It stops once ``max_misses`` slots in a row produce
+        nothing new, i.e. when the model cannot generate unseen phrases.
+        """
+        self.clear_cache()
+        
+        random.seed()
+        
+        entry = self._get_model_entry()
+        if entry.model is None:
+            yield from self._generate_fallback_phrases(entry.tokens, 1)
+            return
+        misses = 0
+        for phrase in self._iter_phrase_slots(entry.model, entry.tokens, set()):
+            if phrase is None:
+                misses += 1
+                if misses >= max_misses:
+                    return
                 continue
-            if not context:
-                context = ["<START>"] * (n - 1)
+            misses = 0
+            yield phrase
+
+    def _get_compiled_model(self) -> CompiledModel:
+        if self._compiled_model is None:
+            compiled = attach_model(self.shared_model) if self.shared_model else load_model(self.model_file)
+            if compiled.n < max(2, int(self.n)):
+                compiled.close()
+                raise ValueError(f"Model artifact '{compiled.path}' only holds orders up to {compiled.n}, but n={self.n} was requested.")
+            if compiled.difficulty and compiled.difficulty != self.difficulty:
+                compiled.close()
+                raise ValueError(f"Model artifact '{compiled.path}' was compiled for '{compiled.difficulty}', not '{self.difficulty}'.")
+            self._compiled_model = compiled
+        return self._compiled_model
 
-            if tok != "<START>":
-                unigram_counts[tok] += 1
+    def save_compiled_model(self, path: str) -> str:
+        if self.backend != "compact":
+            raise ValueError("Compiled model artifacts hold compact-backend models only.")
+        if self._parallel_build:
+            tokens = self._read_tokens(self.corpus_file, difficulty_section=self.difficulty)
+        else:
+            tokens = self._iter_tokens(self.corpus_file, self.difficulty, self.chunk_size or DEFAULT_CHUNK_SIZE)
+        model = self._build_ngram_model(tokens)
+        return compile_model(path, model, self._artifact_metadata(model))
 
-            for order in range(2, n + 1):
-                ctx_tuple = tuple(context[-(order - 1):]) if order > 1 else tuple()
-                bucket = models_by_order[order]
-                bucket.setdefault(ctx_tuple, Counter())[tok] += 1
+    def publish_shared_model(self, name: Optional[str] = None) -> SharedMemory:
+        """Publish the cached model into a shared memory segment.
 
-            context.append(tok)
-            if tok == "<END>":
-                context = []
+        Other processes pass the segment's ``name`` as ``Ngrams(shared_model=...)``
+        and use the model in place, read-only, instead of building their own.
+        The caller owns the segment and must ``close()`` and ``unlink()`` it
+        once those processes are done.
+        """
+        if self.backend != "compact":
+            raise ValueError("Shared model segments hold compact-backend models only.")
+        entry = self._get_model_entry(shuffled=False)
+        if entry.model is None:
+            raise ValueError("The corpus is too small to build a model to publish.")
+        return publish_model(entry.model, name, self._artifact_metadata(entry.model))
 
-        if "<END>" not in unigram_counts:
-            unigram_counts["<END>"] = 1
+    def _artifact_metadata(self, model: CompactModel) -> dict:
+        corpus = self.corpus_file if isinstance(self.corpus_file, (list, tuple)) else [self.corpus_file]
+        return {
+            "difficulty": self.difficulty,
+            "corpus": [str(c) for c in corpus],
+            "pruning": model.pruning_stats,
+        }
 
-        return models_by_order, unigram_counts
+    def _build_ngram_model(self, tokens: Iterable[str]) -> Union[CompactModel, SuffixArrayModel, TrieModel]:
+        if self.backend == "suffix":
+            with self._stage("build"):
+                return build_suffix_model(tokens, self.n)
+        if self.backend == "trie":
+            with self._stage("build"):
+                return build_trie_model(tokens, self.n)
+        with self._stage("build"):
+            if self._parallel_build:
+                tokens = tokens if isinstance(tokens, list) else list(tokens)
+                model = build_compact_model_parallel(tokens, self.n, self.build_workers)
+            else:
+                model = build_compact_model(tokens, self.n)
+        if self.pruning is None:
+            return model
+        with self._stage("prune"):
+            return prune_model(model, self.pruning)
 
     def _generate_phrase_with_model(
         self,
-        models_by_order: Dict[int, Dict[Tuple[str, ...], Counter]],
-        unigram_counts: Counter,
+        model: CompactModel,
         target_words: int,
         in_length_range_fn,
     ) -> List[str]:
         n = max(2, int(self.n))
         words: List[str] = []
+        sampler = self._get_sampler(model, in_length_range_fn)
+        rng = self._rng
         
-        if random.random() < 0.3:
-            all_words = [tok for tok in unigram_counts.keys() if tok.isalpha() and tok not in ["<START>", "<END>"]]
+        if rng.random() < 0.3:
+            all_words = sampler.start_words
             if all_words:
-                random_start = random.choice(all_words)
+                random_start = rng.choice(all_words)
                 context = [random_start] + ["<START>"] * (n - 2) if n > 2 else [random_start]
             else:
                 context = ["<START>"] * (n - 1)
@@ -359,82 +842,66 @@ class Ngrams:
             context = ["<START>"] * (n - 1)
         
         max_steps = target_words * 3
+        min_words = max(1, target_words // 2)
+        steps = ends = 0
 
-        for _ in range(max_steps):
+        for steps in range(1, max_steps + 1):
             ctx_tuple = tuple(context[-(n - 1):]) if n > 1 else tuple()
-            next_token = self._sample_next_token(ctx_tuple, models_by_order, unigram_counts, in_length_range_fn)
+            # <END> is only drawable once the phrase may stop, so no step is spent on an early end.
+            next_token = self._sample_next_token(ctx_tuple, model, in_length_range_fn, allow_end=len(words) >= min_words)
             if next_token is None:
                 break
             if next_token == "<END>":
-                if len(words) >= max(1, target_words // 2):
+                ends += 1
+                if len(words) >= min_words:
                     break
                 continue
             
-            if next_token.isalpha():
-                if in_length_range_fn(len(next_token)):
-                    words.append(next_token)
+            if sampler.filtered or (next_token.isalpha() and in_length_range_fn(len(next_token))):
+                words.append(next_token)
             context.append(next_token)
             if len(words) >= target_words:
                 break
+        
+        profiler = self._profiler
+        if profiler is not None:
+            profiler.observe("steps_per_phrase", steps)
+            profiler.count("steps", steps)
+            profiler.count("rejected_tokens", steps - ends - len(words))
         return words
 
     def _sample_next_token(
         self,
         ctx: Tuple[str, ...],
-        models_by_order: Dict[int, Dict[Tuple[str, ...], Counter]],
-        unigram_counts: Counter,
+        model: CompactModel,
         in_length_range_fn,
+        allow_end: bool = True,
     ) -> Optional[str]:
-        n = max(2, int(self.n))
-        lambdas = self._get_interpolation_weights(n)
-
-        candidates = list(unigram_counts.keys())
-        if not candidates:
-            return None
-
-        total_unigrams = sum(unigram_counts.values()) or 1
-
-        ctx_lists: Dict[int, Tuple[str, ...]] = {}
-        for order in range(2, n + 1):
-            ctx_lists[order] = tuple(ctx[-(order - 1):]) if (order - 1) > 0 else tuple()
-
-        scores: Dict[str, float] = {}
-        for tok in candidates:
-            p = lambdas[1] * (unigram_counts.get(tok, 0) / total_unigrams)
-            for order in range(2, n + 1):
-                weight = lambdas[order]
-                if weight <= 0:
-                    continue
-                dist = models_by_order.get(order, {}).get(ctx_lists[order])
-                if dist:
-                    denom = sum(dist.values()) or 1
-                    p += weight * (dist.get(tok, 0) / denom)
-            p += random.uniform(0, 0.01)
-            scores[tok] = p
-
-        good_tokens = [t for t in candidates if t == "<END>" or (t.isalpha() and in_length_range_fn(len(t)))]
-        pool = good_tokens if good_tokens else candidates
-
-        temperature = 1.2 + random.uniform(0, 0.3)
-        
-        if temperature != 1.0:
-            for tok in pool:
-                scores[tok] = scores.get(tok, 0.0) ** (1.0 / temperature)
-
-        total = sum(scores.get(t, 0.0) for t in pool)
-        if total <= 0:
-            return random.choice(pool)
-
-        if random.random() < 0.1:
-            return random.choice(pool)
+        sampler = self._get_sampler(model, in_length_range_fn)
+        return sampler.sample(ctx, self._rng, allow_end=allow_end)
 
-        r = random.random() * total
-        upto = 0.0
-        for t in pool:
-            upto += scores.get(t, 0.0)
-            if upto >= r:
-                return t
-        return pool[-1]
+    def _get_sampler(self, model: CompactModel, in_length_range_fn) -> InterpolatedSampler:
+        sampler = self._sampler
+        if sampler is None or sampler.model is not model or sampler.version != model.version:
+            entry = self._model_entry
+            shared = entry is not None and entry.model is model
+            if shared and entry.sampler is not None and entry.sampler.version == model.version:
+                sampler = entry.sampler
+            else:
+                n = max(2, int(self.n))
+                with self._stage("sampler_build"):
+                    sampler = InterpolatedSampler(
+                        model,
+                        self._get_interpolation_weights(n),
+                        in_length_range_fn,
+                    )
+                if self._profiler is not None:
+                    self._profiler.observe("candidate_pool", len(sampler.pool))
+                    self._profiler.observe("start_words", len(sampler.start_words))
+                if shared:
+                    entry.sampler = sampler
+            self._sampler = sampler
+        return sampler
 
     def _get_interpolation_weights(self, n: int) -> Dict[int, float]:
         if n <= 2:
@@ -489,48 +956,61 @@ class Ngrams:
 
     def _generate_fallback_phrases(self, tokens: List[str], num_phrases: int) -> List[str]:
         tokens_copy = tokens[:]
-        random.shuffle(tokens_copy)
+        self._rng.shuffle(tokens_copy)
         fallback = " ".join(tokens_copy[:10]) if tokens_copy else ""
         return [fallback for _ in range(num_phrases)]
 
     def _get_target_phrase_length(self) -> int:
         base_length = self._difficulty_lengths.get(self.difficulty, 8)
-        return base_length + random.randint(0, 3)
+        return base_length + self._rng.randint(0, 3)
     
     def _create_phrase_variation(self, phrase_words: List[str]) -> str:
         if not phrase_words:
             return ""
         
-        if len(phrase_words) > 1 and random.random() < 0.3:
+        rng = self._rng
+        if len(phrase_words) > 1 and rng.random() < 0.3:
             shuffled = phrase_words[:]
-            random.shuffle(shuffled)
+            rng.shuffle(shuffled)
             return " ".join(shuffled)
-        elif len(phrase_words) > 2 and random.random() < 0.4:
-            start = random.randint(0, len(phrase_words) - 2)
-            end = random.randint(start + 1, len(phrase_words))
+        elif len(phrase_words) > 2 and rng.random() < 0.4:
+            start = rng.randint(0, len(phrase_words) - 2)
+            end = rng.randint(start + 1, len(phrase_words))
             return " ".join(phrase_words[start:end])
         else:
-            return " ".join(phrase_words) + " " + random.choice(["now", "here", "there", "then", "soon"])
+            return " ".join(phrase_words) + " " + rng.choice(["now", "here", "there", "then", "soon"])
 
     def get_word_frequencies(self, top_k: int = 20) -> List[Tuple[str, int]]:
-        tokens = self._get_tokens(self.corpus_file, difficulty_section=self.difficulty)
-        filtered_tokens = [token for token in tokens 
-                          if token not in ["<START>", "<END>"]]
-        word_counts = Counter(filtered_tokens)
-        return word_counts.most_common(top_k)
+        return self._get_corpus_stats().word_counts.most_common(top_k)
 
     def get_difficulty_stats(self) -> dict:
-        tokens = self._get_tokens(self.corpus_file, difficulty_section=self.difficulty)
-        self._analyze_word_difficulty(tokens)
-        return self._get_difficulty_stats()
+        return self._get_corpus_stats().difficulty_stats
 
-    def _get_difficulty_stats(self) -> Dict[str, Dict]:
-        if not self._word_difficulty_cache:
-            raise ValueError("No word difficulty analysis performed yet. Call analyze_word_difficulty() first.")
-        
-        easy_words = [word for word, diff in self._word_difficulty_cache.items() if diff == "easy"]
-        medium_words = [word for word, diff in self._word_difficulty_cache.items() if diff == "medium"]
-        hard_words = [word for word, diff in self._word_difficulty_cache.items() if diff == "hard"]
+    def _get_corpus_stats(self) -> CorpusStats:
+        entry = self._model_entry if self._model_entry is not None else self._get_model_entry()
+        return self._with_stats(entry).corpus_stats
+
+    def _with_stats(self, entry: ModelEntry) -> ModelEntry:
+        """Fill in the entry's difficulty buckets and per-order sizes, once per entry.
+
+        Built entries get them right away; an updated entry starts without
+        them (see :meth:`_updated_entry`) and gets them on first use.
+        """
+        corpus_stats = entry.corpus_stats
+        if corpus_stats is None:
+            # Compiled and shared models may come from any corpus, so their
+            # counts are taken from the model rather than ``corpus_file``.
+            corpus_stats = entry.corpus_stats = CorpusStats.from_model(entry.model)
+        if corpus_stats.difficulty_stats is None:
+            corpus_stats.difficulty_stats = self._get_difficulty_stats(self._analyze_word_counts(corpus_stats.word_counts))
+        if corpus_stats.order_sizes is None:
+            corpus_stats.order_sizes = entry.model.order_sizes() if entry.model is not None else {}
+        return entry
+
+    def _get_difficulty_stats(self, word_difficulty: Dict[str, str]) -> Dict[str, Dict]:
+        easy_words = [word for word, diff in word_difficulty.items() if diff == "easy"]
+        medium_words = [word for word, diff in word_difficulty.items() if diff == "medium"]
+        hard_words = [word for word, diff in word_difficulty.items() if diff == "hard"]
         
         return {
             "easy": {
@@ -548,26 +1028,61 @@ class Ngrams:
         }
 
     def get_model_stats(self) -> dict:
-        tokens = self._get_tokens(self.corpus_file, difficulty_section=self.difficulty)
-        
-        filtered_tokens = [token for token in tokens 
-                          if token not in ["<START>", "<END>"]]
+        corpus_stats = self._get_corpus_stats()
         
         return {
-            "total_tokens": len(tokens),
-            "unique_words": len(set(filtered_tokens)),
+            "total_tokens": corpus_stats.total_tokens,
+            "unique_words": corpus_stats.unique_words,
             "n_gram_order": self.n,
-            "vocabulary_size": len(set(filtered_tokens)),
+            "vocabulary_size": corpus_stats.unique_words,
             "difficulty": self.difficulty,
-            "difficulty_stats": self.get_difficulty_stats()
+            "difficulty_stats": corpus_stats.difficulty_stats,
+            "contexts_per_order": {order: sizes["contexts"] for order, sizes in corpus_stats.order_sizes.items()},
+            "memory": self.get_memory_stats()
+        }
+
+    def get_memory_stats(self) -> dict:
+        entry = self._model_entry if self._model_entry is not None else self._get_model_entry()
+        model = entry.model
+        if model is None:
+            return {}
+        stats = {
+            "model_bytes": model.nbytes,
+            "orders": self._with_stats(entry).corpus_stats.order_sizes,
         }
+        pruning_stats = model.pruning_stats
+        if pruning_stats is None and isinstance(model, CompiledModel):
+            pruning_stats = model.header.get("pruning")
+        if pruning_stats:
+            stats["pruning"] = pruning_stats
+        return stats
     
     def clear_cache(self):
         self._text_cache = None
-        self._tokens_cache = None
-        self._word_difficulty_cache.clear()
-        self._tokens_analyzed.clear()
         self._difficulty_words_cache = None
+        self._sampler = None
+        self._phrase_scorer = None
+        self._model_entry = None
+
+
+def _score_batch_task(task: Tuple[dict, List[str]]) -> List[PhraseScore]:
+    config, phrases = task
+    return Ngrams(**config).score_phrases(phrases)
+
+
+def _generate_batch_task(task: Tuple[Dict[bool, dict], int, str]) -> List[str]:
+    configs, count, seed = task
+    # A task-local RNG keeps the caller's global RNG untouched (workers=1
+    # runs tasks in-process) and makes the output depend on the seed alone.
+    rng = random.Random(seed)
+    shuffled = rng.random() < 0.2
+    generator = Ngrams(**configs[shuffled])
+    generator._rng = rng
+    # A shared variant is precompiled: its segment already holds the shuffle.
+    entry = generator._get_model_entry(shuffled=shuffled and not generator._precompiled)
+    if entry.model is None:
+        return generator._generate_fallback_phrases(entry.tokens, count)
+    return generator._generate_phrases_from_model(entry.model, count, entry.tokens)
 
 
 def print_menu(title: str, options: List[str]) -> None:
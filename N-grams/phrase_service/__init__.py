@@ -0,0 +1,9 @@
+from .client import SERVICE_ENV, PhraseClient, phrase_source
+from .server import PhraseServer
+
+__all__ = [
+    "SERVICE_ENV",
+    "PhraseClient",
+    "PhraseServer",
+    "phrase_source",
+]
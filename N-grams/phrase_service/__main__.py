@@ -0,0 +1,41 @@
+import argparse
+import asyncio
+
+from . import PhraseServer
+from .server import DEFAULT_CORPUS, DEFAULT_HOST, DEFAULT_PORT
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve n-gram phrases to local typing clients")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", help="listen on this Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--threads", action="store_true", help="use a thread pool instead of processes")
+    parser.add_argument("--max-pending", type=int, default=64)
+    args = parser.parse_args()
+
+    server = PhraseServer(
+        corpus_file=args.corpus,
+        host=args.host,
+        port=args.port,
+        unix_path=args.unix,
+        workers=args.workers,
+        use_processes=not args.threads,
+        max_pending=args.max_pending,
+    )
+
+    async def run() -> None:
+        await server.start()
+        print(f"✅ Phrase service listening on {server.address} (warm: {server.warm_models})")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        print("\n👋 Phrase service stopped.")
+
+
+if __name__ == "__main__":
+    main()
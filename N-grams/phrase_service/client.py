@@ -0,0 +1,108 @@
+import http.client
+import json
+import os
+import socket
+from typing import Iterator, List, Optional, Union
+from urllib.parse import urlencode
+
+from ngrams import Ngrams
+
+from .server import DEFAULT_CORPUS
+
+# "host:port" or "unix:/path/to.sock"; when unset TypingGame builds its own models.
+SERVICE_ENV = "NGRAMS_PHRASE_SERVICE"
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self.unix_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.unix_path)
+
+
+class PhraseClient:
+    """Drop-in stand-in for ``Ngrams`` that asks a running :class:`PhraseServer`.
+
+    Only the generation surface is mirrored: ``generate_phrases`` and
+    ``iter_phrases``. Errors surface as ``ConnectionError``.
+    """
+
+    def __init__(self, address: str, n: int = 3, num_phrases: int = 5, difficulty: str = "medium", timeout: float = 5.0):
+        self.address = address
+        self.n = n
+        self.num_phrases = num_phrases
+        self.difficulty = difficulty.lower()
+        self.timeout = timeout
+
+    def _connection(self) -> http.client.HTTPConnection:
+        if self.address.startswith("unix:"):
+            return _UnixHTTPConnection(self.address[len("unix:"):], self.timeout)
+        host, _, port = self.address.rpartition(":")
+        return http.client.HTTPConnection(host or "127.0.0.1", int(port), timeout=self.timeout)
+
+    def _get(self, path: str, **params) -> dict:
+        conn = self._connection()
+        try:
+            conn.request("GET", f"{path}?{urlencode(params)}" if params else path)
+            response = conn.getresponse()
+            body = json.loads(response.read().decode("utf-8") or "{}")
+        except (OSError, ValueError, http.client.HTTPException) as e:
+            raise ConnectionError(f"Phrase service at {self.address} is unavailable: {e}")
+        finally:
+            conn.close()
+        if response.status != 200:
+            raise ConnectionError(f"Phrase service error {response.status}: {body.get('error', '')}")
+        return body
+
+    def health(self) -> dict:
+        return self._get("/health")
+
+    def generate_phrases(self) -> List[str]:
+        body = self._get("/generate", difficulty=self.difficulty, n=self.n, num_phrases=self.num_phrases)
+        return body["phrases"]
+
+    def refill(self, chars: int) -> List[str]:
+        return self._get("/refill", difficulty=self.difficulty, n=self.n, chars=chars)["phrases"]
+
+    def iter_phrases(self, batch_chars: int = 400, max_misses: int = 5) -> Iterator[str]:
+        """Yield unique phrases, refilling ``batch_chars`` worth at a time.
+
+        Every refill is served from a fresh stream on the server, so phrases
+        are deduplicated here for the life of the iterator, as
+        ``Ngrams.iter_phrases`` does locally. It stops once ``max_misses``
+        refills in a row bring nothing new.
+        """
+        seen = set()
+        misses = 0
+        while misses < max_misses:
+            phrases = self.refill(batch_chars)
+            if not phrases:
+                return
+            misses += 1
+            for phrase in phrases:
+                if phrase not in seen:
+                    seen.add(phrase)
+                    misses = 0
+                    yield phrase
+
+
+def phrase_source(
+    corpus_file: str = DEFAULT_CORPUS,
+    n: int = 3,
+    difficulty: str = "medium",
+    address: Optional[str] = None,
+) -> Union[PhraseClient, Ngrams]:
+    """A :class:`PhraseClient` when a phrase service answers, else a local ``Ngrams``"""
+    address = address or os.environ.get(SERVICE_ENV)
+    if address:
+        client = PhraseClient(address, n=n, difficulty=difficulty)
+        try:
+            client.health()
+            return client
+        except ConnectionError as e:
+            print(f"{e}; generating phrases locally.")
+    return Ngrams(corpus_file=corpus_file, n=n, difficulty=difficulty)
@@ -0,0 +1,265 @@
+import asyncio
+import json
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from ngrams import Ngrams
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_CORPUS = "corpora/corpora.pkl"
+DIFFICULTIES = ("easy", "medium", "hard")
+# Orders TypingGame uses for Easy/Medium/Hard.
+DEFAULT_WARM = (("easy", 2), ("medium", 3), ("hard", 4))
+MAX_PHRASES = 500
+MAX_CHARS = 20000
+
+# Generators kept warm inside each worker, keyed by (corpus, difficulty, n).
+# An Ngrams instance holds per-stream state (dedup set, current entry), so
+# with a thread pool every thread keeps its own; the models behind them are
+# shared through the process-wide registry.
+_worker_state = threading.local()
+
+
+def _worker_generator(corpus_file: str, difficulty: str, n: int) -> Ngrams:
+    generators: Optional[Dict[Tuple[str, str, int], Ngrams]] = getattr(_worker_state, "generators", None)
+    if generators is None:
+        generators = _worker_state.generators = {}
+    key = (corpus_file, difficulty, n)
+    generator = generators.get(key)
+    if generator is None:
+        generator = generators[key] = Ngrams(corpus_file=corpus_file, n=n, difficulty=difficulty)
+    return generator
+
+
+def _warm_task(corpus_file: str, difficulty: str, n: int) -> Tuple[str, int]:
+    _worker_generator(corpus_file, difficulty, n).generate_phrases()
+    return difficulty, n
+
+
+def _generate_task(corpus_file: str, difficulty: str, n: int, requests: List[Tuple[int, int]]) -> List[List[str]]:
+    """Serve several coalesced ``(num_phrases, min_chars)`` requests from one phrase stream.
+
+    Phrases are unique across the whole batch, so coalesced callers never
+    receive the same phrase.
+    """
+    stream = _worker_generator(corpus_file, difficulty, n).iter_phrases()
+    results: List[List[str]] = []
+    for num_phrases, min_chars in requests:
+        phrases: List[str] = []
+        chars = 0
+        while len(phrases) < num_phrases or chars < min_chars:
+            phrase = next(stream, None)
+            if phrase is None:
+                break
+            phrases.append(phrase)
+            chars += len(phrase) + 1
+        results.append(phrases)
+    return results
+
+
+class _Batch:
+    __slots__ = ("requests", "futures")
+
+    def __init__(self):
+        self.requests: List[Tuple[int, int]] = []
+        self.futures: List[asyncio.Future] = []
+
+
+class PhraseServer:
+    """Offline HTTP phrase service on localhost or a Unix socket.
+
+    ``GET /generate?difficulty=medium&n=3&num_phrases=5`` mirrors
+    ``Ngrams.generate_phrases``; ``GET /refill?...&chars=200`` returns
+    phrases until at least ``chars`` characters. Requests for the same
+    difficulty/order that arrive within ``coalesce_window`` seconds share one
+    worker call, and once ``max_pending`` requests are queued new ones get
+    ``503`` with ``Retry-After``.
+    """
+
+    def __init__(
+        self,
+        corpus_file: str = DEFAULT_CORPUS,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        unix_path: Optional[str] = None,
+        workers: Optional[int] = None,
+        use_processes: bool = True,
+        warm: Iterable[Tuple[str, int]] = DEFAULT_WARM,
+        max_pending: int = 64,
+        coalesce_window: float = 0.005,
+    ):
+        self.corpus_file = corpus_file
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.use_processes = use_processes
+        self.warm = tuple((difficulty, int(n)) for difficulty, n in warm)
+        self.max_pending = max(1, int(max_pending))
+        self.coalesce_window = coalesce_window
+        self.pending = 0
+        self.served = 0
+        self.rejected = 0
+        self.worker_calls = 0
+        self.warm_models: List[Tuple[str, int]] = []
+        self._batches: Dict[Tuple[str, int], _Batch] = {}
+        self._executor: Optional[Executor] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> asyncio.AbstractServer:
+        if self.use_processes:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers)
+        loop = asyncio.get_running_loop()
+        warmups = [
+            loop.run_in_executor(self._executor, _warm_task, self.corpus_file, difficulty, n)
+            for difficulty, n in self.warm
+            for _ in range(self.workers if self.use_processes else 1)
+        ]
+        for result in await asyncio.gather(*warmups, return_exceptions=True):
+            if not isinstance(result, BaseException) and result not in self.warm_models:
+                self.warm_models.append(result)
+
+        if self.unix_path:
+            if os.path.exists(self.unix_path):
+                os.remove(self.unix_path)
+            self._server = await asyncio.start_unix_server(self._handle, path=self.unix_path)
+        else:
+            self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        return self._server
+
+    async def serve_forever(self) -> None:
+        server = self._server or await self.start()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        if self.unix_path and os.path.exists(self.unix_path):
+            os.remove(self.unix_path)
+
+    @property
+    def address(self) -> str:
+        if self.unix_path:
+            return f"unix:{self.unix_path}"
+        if self._server is not None and self._server.sockets:
+            host, port = self._server.sockets[0].getsockname()[:2]
+            return f"{host}:{port}"
+        return f"{self.host}:{self.port}"
+
+    def stats(self) -> dict:
+        return {
+            "status": "ok",
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "served": self.served,
+            "rejected": self.rejected,
+            "worker_calls": self.worker_calls,
+            "workers": self.workers,
+            "warm_models": [{"difficulty": d, "n": n} for d, n in self.warm_models],
+        }
+
+    async def generate(self, difficulty: str, n: int, num_phrases: int, min_chars: int = 0) -> List[str]:
+        """Queue one request on the coalescing batch for ``(difficulty, n)``."""
+        key = (difficulty, n)
+        batch = self._batches.get(key)
+        if batch is None:
+            batch = self._batches[key] = _Batch()
+            asyncio.get_running_loop().call_later(self.coalesce_window, self._flush, key)
+        future = asyncio.get_running_loop().create_future()
+        batch.requests.append((num_phrases, min_chars))
+        batch.futures.append(future)
+        return await future
+
+    def _flush(self, key: Tuple[str, int]) -> None:
+        batch = self._batches.pop(key, None)
+        if batch is None:
+            return
+        self.worker_calls += 1
+        difficulty, n = key
+        task = asyncio.get_running_loop().run_in_executor(
+            self._executor, _generate_task, self.corpus_file, difficulty, n, batch.requests
+        )
+
+        def deliver(done: "asyncio.Future") -> None:
+            error = done.exception()
+            results = None if error else done.result()
+            for i, future in enumerate(batch.futures):
+                if future.done():
+                    continue
+                if error:
+                    future.set_exception(error)
+                else:
+                    future.set_result(results[i])
+
+        task.add_done_callback(deliver)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = await reader.readline()
+            while True:
+                line = await reader.readline()
+                if not line or line in (b"\r\n", b"\n"):
+                    break
+            status, body, headers = await self._dispatch(request_line.decode("latin-1").split())
+        except Exception as e:
+            status, body, headers = 500, {"error": str(e)}, {}
+        payload = json.dumps(body).encode("utf-8")
+        head = [f"HTTP/1.1 {status} {_REASONS.get(status, 'OK')}", "Content-Type: application/json",
+                f"Content-Length: {len(payload)}", "Connection: close"]
+        head.extend(f"{name}: {value}" for name, value in headers.items())
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + payload)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def _dispatch(self, parts: List[str]) -> Tuple[int, dict, Dict[str, str]]:
+        if len(parts) < 2 or parts[0] != "GET":
+            return 405, {"error": "Only GET is supported."}, {}
+        url = urlsplit(parts[1])
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if url.path == "/health":
+            return 200, self.stats(), {}
+        if url.path not in ("/generate", "/refill"):
+            return 404, {"error": f"Unknown endpoint '{url.path}'."}, {}
+
+        try:
+            difficulty = query.get("difficulty", "medium").lower()
+            n = int(query.get("n", 3))
+            num_phrases = int(query.get("num_phrases", 5 if url.path == "/generate" else 0))
+            min_chars = int(query.get("chars", 0 if url.path == "/generate" else 200))
+        except ValueError as e:
+            return 400, {"error": f"Invalid parameter: {e}"}, {}
+        if difficulty not in DIFFICULTIES or not 2 <= n <= 5:
+            return 400, {"error": "difficulty must be easy/medium/hard and n between 2 and 5."}, {}
+        if not 0 <= num_phrases <= MAX_PHRASES or not 0 <= min_chars <= MAX_CHARS:
+            return 400, {"error": f"num_phrases must be <= {MAX_PHRASES} and chars <= {MAX_CHARS}."}, {}
+
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            return 503, {"error": "Too many pending requests."}, {"Retry-After": "1"}
+        self.pending += 1
+        try:
+            phrases = await self.generate(difficulty, n, num_phrases, min_chars)
+        finally:
+            self.pending -= 1
+        self.served += 1
+        return 200, {"difficulty": difficulty, "n": n, "phrases": phrases}, {}
+
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error", 503: "Service Unavailable"}
@@ -33,7 +33,7 @@ from .constants import (
 )
 from .particles import Particle
 from .ui import ModernButton, OutlineButton
-from ngrams import Ngrams
+from phrase_service import phrase_source
 
 
 class TypingGame:
@@ -79,9 +79,8 @@ class TypingGame:
         self.num_phrases = 8
         self.time_limit = 60
         self.time_remaining = self.time_limit
-        self.base_target_len = 8
-        self.avg_word_len = 6.0
         self.ngrams_obj = None
+        self.phrase_stream = iter(())
         self.render_start_index = 0
         self.setup_ui()
         self.generate_background_particles()
@@ -431,32 +430,16 @@ class TypingGame:
         self.difficulty = difficulty
         if difficulty == "Easy":
             self.n_gram = 2
-            self.base_target_len = 6
-            self.avg_word_len = 3.5
         elif difficulty == "Medium":
             self.n_gram = 3
-            self.base_target_len = 8
-            self.avg_word_len = 6.0
         elif difficulty == "Hard":
             self.n_gram = 4
-            self.base_target_len = 10
-            self.avg_word_len = 8.0
         try:
-            random.seed()
-            approx_chars_per_phrase = int(self.base_target_len * (self.avg_word_len + 1))
             min_chars = int(self.time_limit * 8)
-            num_phrases = max(5, min(40, (min_chars + approx_chars_per_phrase - 1) // approx_chars_per_phrase))
-            num_phrases += random.randint(-2, 2)
-            num_phrases = max(3, min(50, num_phrases))
-            self.ngrams_obj = Ngrams(corpus_file="corpora/corpora.pkl", n=self.n_gram, num_phrases=num_phrases, difficulty=self.difficulty.lower())
-            test_phrases = self.ngrams_obj.generate_phrases()
-            self.target_text = " ".join(phrase for phrase in test_phrases if phrase.strip())
-            if len(self.target_text) < min_chars:
-                extra_needed = min_chars - len(self.target_text)
-                extra_phrases = max(3, (extra_needed + approx_chars_per_phrase - 1) // approx_chars_per_phrase)
-                tmp = Ngrams(corpus_file="corpora/corpora.pkl", n=self.n_gram, num_phrases=extra_phrases, difficulty=self.difficulty.lower())
-                test_phrases += tmp.generate_phrases()
-                self.target_text = " ".join(phrase for phrase in test_phrases if phrase.strip())
+            self.ngrams_obj = phrase_source(corpus_file="corpora/corpora.pkl", n=self.n_gram, difficulty=self.difficulty.lower())
+            self.phrase_stream = self.ngrams_obj.iter_phrases()
+            self.target_text = ""
+            self.extend_target_text(min_chars)
             self.total_chars = len(self.target_text)
             self.state = GAME
             self.typing_text = ""
@@ -503,22 +486,32 @@ class TypingGame:
                     else:
                         self.end_game()
 
+    def extend_target_text(self, needed_chars: int) -> int:
+        added = 0
+        restarted = False
+        while added < needed_chars:
+            phrase = next(self.phrase_stream, None)
+            if phrase is None:
+                if restarted:
+                    break
+                self.phrase_stream = self.ngrams_obj.iter_phrases()
+                restarted = True
+                continue
+            if not phrase.strip():
+                continue
+            if self.target_text and not self.target_text.endswith(" "):
+                self.target_text += " "
+                added += 1
+            self.target_text += phrase
+            added += len(phrase)
+        return added
+
     def refill_target_text(self):
         try:
-            random.seed()
-            approx_chars_per_phrase = int(self.base_target_len * (self.avg_word_len + 1)) or 20
             needed_chars = max(200, int(self.time_remaining * 8))
-            extra_phrases = max(3, min(40, (needed_chars + approx_chars_per_phrase - 1) // approx_chars_per_phrase))
-            extra_phrases += random.randint(-1, 2)
-            extra_phrases = max(2, min(50, extra_phrases))
-            generator = Ngrams(corpus_file="corpora/corpora.pkl", n=self.n_gram, num_phrases=extra_phrases, difficulty=self.difficulty.lower())
-            more_phrases = generator.generate_phrases()
-            extra_text = " ".join(p for p in more_phrases if p.strip())
-            if extra_text:
-                if self.target_text and not self.target_text.endswith(" "):
-                    self.target_text += " "
-                self.target_text += extra_text
-                self.total_chars = len(self.target_text)
+            if not self.extend_target_text(needed_chars):
+                raise ValueError("No phrases generated")
+            self.total_chars = len(self.target_text)
         except Exception:
             fallback = " keep typing to improve your speed and accuracy."
             self.target_text += fallback